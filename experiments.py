@@ -1,17 +1,231 @@
-#!/usr/bin/env python3
-"""
-Experimental comparison of planning algorithms
-"""
-
-import time
-import json
-import matplotlib.pyplot as plt
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from environment import GridEnvironment
-from planners.uninformed import BFSPlanner, UniformCostPlanner
-from planners.informed import AStarPlanner
-from planners.local_search import HillCl
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Experimental comparison of planning algorithms
+"""
+
+import time
+import json
+import random
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.environment import GridEnvironment, Terrain
+from src.planners.uninformed import BFSPlanner, UniformCostPlanner
+from src.planners.informed import AStarPlanner
+from src.planners.local_search import HillClimbingPlanner, SimulatedAnnealingPlanner, GeneticPlanner
+from src.planners.memory_bounded import FrontierAStarPlanner
+from src.planners.open_lists import OPEN_LISTS
+from src.planners.contraction import ContractionHierarchyPlanner
+from src.planners.realtime import RealTimePlanner
+from src.simulation import Scenario
+from src.utils import load_map, calculate_path_cost, save_results
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps')
+
+def random_city(size: int, seed: int = 0):
+    """Square grid with mixed terrain and scattered obstacles for scaling runs"""
+    rng = random.Random(seed)
+    env = GridEnvironment(size, size)
+    for y in range(size):
+        for x in range(size):
+            roll = rng.random()
+            if roll < 0.15:
+                env.set_static_obstacle(x, y)
+            elif roll < 0.35:
+                env.set_terrain(x, y, Terrain.GRASS)
+            elif roll < 0.45:
+                env.set_terrain(x, y, Terrain.SAND)
+    for cell in ((0, 0), (size - 1, size - 1)):
+        env.grid[cell[1]][cell[0]].is_obstacle = False
+        env.set_terrain(cell[0], cell[1], Terrain.ROAD)
+    return env, (0, 0), (size - 1, size - 1)
+
+def run_planner(planner, start, goal, env):
+    start_time = time.perf_counter()
+    path = planner.plan(start, goal)
+    elapsed = time.perf_counter() - start_time
+    return {
+        'success': bool(path) and path[-1] == goal,
+        'path_length': len(path),
+        'path_cost': calculate_path_cost(path, env) if path else None,
+        'nodes_expanded': planner.nodes_expanded,
+        'time': elapsed,
+    }
+
+def compare_planners(env, start, goal):
+    planners = {
+        'BFS': BFSPlanner(env),
+        'UCS': UniformCostPlanner(env),
+        'A*': AStarPlanner(env),
+        'Frontier A*': FrontierAStarPlanner(env),
+        'Hill Climbing': HillClimbingPlanner(env),
+        'Simulated Annealing': SimulatedAnnealingPlanner(env),
+        'Genetic': GeneticPlanner(env, seed=0),
+    }
+    return {name: run_planner(planner, start, goal, env) for name, planner in planners.items()}
+
+def compare_open_lists(env, start, goal):
+    """UCS and A* with every open-list implementation on the same query"""
+    results = {}
+    for kind in OPEN_LISTS:
+        results[f'UCS/{kind}'] = run_planner(UniformCostPlanner(env, open_list=kind), start, goal, env)
+        results[f'A*/{kind}'] = run_planner(AStarPlanner(env, open_list=kind), start, goal, env)
+    return results
+
+def random_queries(env, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    free = [(x, y) for y in range(env.height) for x in range(env.width)
+            if env.get_cost(x, y) < float('inf')]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+def evaluate_contraction(env, queries):
+    """Preprocessing cost and per-query speedup of contraction hierarchies over A*"""
+    planner = ContractionHierarchyPlanner(env)
+    planner.prepare()
+    result = planner.compare_with_astar(queries)
+    result.update({
+        'preprocessing_time': planner.preprocessing_time,
+        'index_bytes': planner.index_size,
+        'shortcuts': planner.hierarchy.num_shortcuts,
+    })
+    return result
+
+def evaluate_realtime(env, start, goal, lookahead: int = 32, max_trials: int = 200):
+    """Time to first move against full A* planning, and runs until the heuristic converges.
+
+    The real-time planner runs first, so its first move also pays the
+    one-off setup (connectivity index and heuristic table), reported on its
+    own as setup_time; A* then reuses the connectivity index.
+    """
+    planner = RealTimePlanner(env, lookahead=lookahead)
+    first = planner.plan(start, goal)
+    latencies = planner.step_latencies
+    setup_time = planner.setup_latency
+    astar = run_planner(AStarPlanner(env), start, goal, env)
+    trials = planner.train(start, goal, max_trials)
+    return {
+        'astar_time': astar['time'],
+        'astar_cost': astar['path_cost'],
+        'first_move_latency': latencies[0] if latencies else 0.0,
+        'setup_time': setup_time,
+        'mean_step_latency': sum(latencies) / max(len(latencies), 1),
+        'first_run_cost': calculate_path_cost(first, env) if first else None,
+        'converged_cost': planner.trials[goal][-1]['cost'],
+        'trials_to_converge': trials,
+    }
+
+def benchmark_simulation(size: int = 300, obstacles: int = 5000, ticks: int = 200, seed: int = 0):
+    """Obstacle-steps per second of Scenario.advance with many moving obstacles"""
+    rng = random.Random(seed)
+    env = GridEnvironment(size, size)
+    for _ in range(obstacles):
+        x, y = rng.randrange(size), rng.randrange(size)
+        length = rng.randint(2, 8)
+        env.add_moving_obstacle([(min(size - 1, x + i), y) for i in range(length)], rng.randint(1, 3))
+    scenario = Scenario(env)
+    start_time = time.time()
+    for _ in range(ticks):
+        scenario.advance(1)
+    elapsed = time.time() - start_time
+    return {
+        'obstacles': obstacles,
+        'ticks': ticks,
+        'time': elapsed,
+        'obstacle_steps_per_second': obstacles * ticks / elapsed,
+    }
+
+def print_table(title, results):
+    print(f"\n{title}")
+    print(f"{'Planner':<22}{'Success':<9}{'Cost':<8}{'Expanded':<10}{'Time (s)':<10}")
+    for name, r in results.items():
+        cost = r['path_cost'] if r['path_cost'] is not None else '-'
+        print(f"{name:<22}{str(r['success']):<9}{cost:<8}{r['nodes_expanded']:<10}{r['time']:<10.4f}")
+
+def plot_open_lists(all_results, filename):
+    labels = list(all_results)
+    kinds = list(OPEN_LISTS)
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4))
+    for ax, algorithm in zip(axes, ('UCS', 'A*')):
+        width = 0.8 / len(kinds)
+        for i, kind in enumerate(kinds):
+            times = [all_results[label][f'{algorithm}/{kind}']['time'] for label in labels]
+            ax.bar([j + i * width for j in range(len(labels))], times, width, label=kind)
+        ax.set_xticks([j + 0.4 - width / 2 for j in range(len(labels))])
+        ax.set_xticklabels(labels)
+        ax.set_ylabel('Planning time (s)')
+        ax.set_title(f'{algorithm} open lists')
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+def main():
+    results = {'planners': {}, 'open_lists': {}, 'local_search': {}, 'contraction': {},
+               'realtime': {}}
+
+    for map_name in sorted(os.listdir(MAP_DIR)):
+        if not map_name.endswith('.map'):
+            continue
+        env, start, goal = load_map(os.path.join(MAP_DIR, map_name))
+        results['planners'][map_name] = compare_planners(env, start, goal)
+        results['open_lists'][map_name] = compare_open_lists(env, start, goal)
+        print_table(f"{map_name} ({env.width}x{env.height})", results['planners'][map_name])
+
+    # The shipped maps are too small to separate the open lists
+    for size in (100, 250):
+        env, start, goal = random_city(size)
+        results['open_lists'][f'random{size}'] = compare_open_lists(env, start, goal)
+
+    for label, open_list_results in results['open_lists'].items():
+        print_table(f"Open lists: {label}", open_list_results)
+
+    # Local search beyond the small maps, with A* as the reference cost
+    env, start, goal = random_city(100)
+    local_planners = {
+        'A*': AStarPlanner(env),
+        'Hill Climbing': HillClimbingPlanner(env),
+        'Simulated Annealing': SimulatedAnnealingPlanner(env),
+        'Genetic': GeneticPlanner(env, seed=0),
+    }
+    results['local_search']['random100'] = {
+        name: run_planner(planner, start, goal, env) for name, planner in local_planners.items()}
+    print_table("Local search: random100", results['local_search']['random100'])
+
+    ch_maps = {name: load_map(os.path.join(MAP_DIR, name))[0]
+               for name in sorted(os.listdir(MAP_DIR)) if name.endswith('.map')}
+    ch_maps['random60'] = random_city(60)[0]
+
+    print(f"\n{'Map':<14}{'Prep (s)':<10}{'Index (KB)':<12}{'Shortcuts':<11}{'Speedup':<8}")
+    for label, env in ch_maps.items():
+        r = evaluate_contraction(env, random_queries(env, 200))
+        results['contraction'][label] = r
+        print(f"{label:<14}{r['preprocessing_time']:<10.2f}{r['index_bytes'] / 1024:<12.1f}"
+              f"{r['shortcuts']:<11}{r['speedup']:<8.1f}")
+
+    print(f"\n{'Map':<12}{'A* (ms)':<10}{'1st move (ms)':<15}{'Setup (ms)':<12}"
+          f"{'Cost 1st/conv/A*':<20}{'Runs':<6}")
+    for size in (60, 150):
+        env, start, goal = random_city(size)
+        r = evaluate_realtime(env, start, goal)
+        results['realtime'][f'random{size}'] = r
+        costs = f"{r['first_run_cost']}/{r['converged_cost']}/{r['astar_cost']}"
+        print(f"{'random' + str(size):<12}{r['astar_time'] * 1000:<10.2f}"
+              f"{r['first_move_latency'] * 1000:<15.3f}{r['setup_time'] * 1000:<12.3f}"
+              f"{costs:<20}{r['trials_to_converge']:<6}")
+
+    r = benchmark_simulation()
+    results['simulation'] = r
+    print(f"\nSimulation: {r['obstacles']} moving obstacles on 300x300, "
+          f"{r['obstacle_steps_per_second'] / 1e6:.2f}M obstacle-steps/s")
+
+    save_results(results, 'experiment_results.json')
+    plot_open_lists(results['open_lists'], 'open_list_comparison.png')
+    print("\nResults saved to experiment_results.json and open_list_comparison.png")
+
+if __name__ == "__main__":
+    main()
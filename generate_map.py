@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Procedural city map generator
+"""
+
+import argparse
+import time
+import sys
+import os
+
+# Add the project root to path so the src package is importable
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.mapgen import CityMapGenerator
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a large seeded city map')
+    parser.add_argument('width', type=int, help='Map width in cells')
+    parser.add_argument('height', type=int, help='Map height in cells')
+    parser.add_argument('output', help='Path of the .map file to write')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--block-size', type=int, default=10, help='Distance between streets')
+    parser.add_argument('--street-width', type=int, default=1, help='Width of each street')
+    parser.add_argument('--building-density', type=float, default=0.3,
+                       help='Fraction of blocks filled with buildings')
+    parser.add_argument('--park-density', type=float, default=0.1,
+                       help='Fraction of blocks that are parks')
+    parser.add_argument('--maze-density', type=float, default=0.05,
+                       help='Fraction of blocks laid out as mazes')
+    parser.add_argument('--terrain-density', type=float, default=0.05,
+                       help='Approximate fraction of the map under grass/sand patches')
+    parser.add_argument('--water-density', type=float, default=0.03,
+                       help='Approximate fraction of the map under water')
+    parser.add_argument('--moving-density', type=float, default=0.001,
+                       help='Moving obstacles per street cell')
+    parser.add_argument('--compact', action='store_true',
+                       help='Write rows without spaces between cells')
+
+    args = parser.parse_args()
+
+    try:
+        generator = CityMapGenerator(
+            args.width, args.height, seed=args.seed, block_size=args.block_size,
+            street_width=args.street_width, building_density=args.building_density,
+            park_density=args.park_density, maze_density=args.maze_density,
+            terrain_density=args.terrain_density, water_density=args.water_density,
+            moving_density=args.moving_density)
+
+        start_time = time.time()
+        generator.save(args.output, compact=args.compact)
+        elapsed = time.time() - start_time
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    start, goal = generator.endpoints()
+    print(f"Wrote {args.output}: {args.width} x {args.height} "
+          f"({args.width * args.height:,} cells) in {elapsed:.2f} seconds")
+    print(f"Start: {start}, Goal: {goal}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,111 +1,209 @@
-#!/usr/bin/env python3
-"""
-Autonomous Delivery Agent Runner
-"""
-
-import argparse
-import time
-import sys
-import os
-
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from environment import GridEnvironment
-from agent import DeliveryAgent
-from planners.uninformed import BFSPlanner, UniformCostPlanner
-from planners.informed import AStarPlanner
-from planners.local_search import HillClimbingPlanner, SimulatedAnnealingPlanner
-from utils import load_map, print_statistics, visualize_path
-
-def main():
-    parser = argparse.ArgumentParser(description='Autonomous Delivery Agent')
-    parser.add_argument('map_file', help='Path to the map file')
-    parser.add_argument('--planner', choices=['bfs', 'ucs', 'astar', 'hillclimb', 'annealing'],
-                       default='astar', help='Path planning algorithm')
-    parser.add_argument('--heuristic', choices=['manhattan', 'euclidean', 'chebyshev'],
-                       default='manhattan', help='Heuristic for A*')
-    parser.add_argument('--dynamic', action='store_true', help='Enable dynamic obstacles')
-    parser.add_argument('--visualize', action='store_true', help='Show visualization')
-    parser.add_argument('--fuel', type=int, default=1000, help='Initial fuel amount')
-    
-    args = parser.parse_args()
-    
-    if not os.path.exists(args.map_file):
-        print(f"Error: Map file '{args.map_file}' not found")
-        return 1
-    
-    try:
-        # Load environment and positions
-        env, start, goal = load_map(args.map_file)
-        
-        print(f"Loaded map: {args.map_file}")
-        print(f"Grid size: {env.width} x {env.height}")
-        print(f"Start: {start}, Goal: {goal}")
-        
-        # Create agent
-        agent = DeliveryAgent(start, goal, env, fuel=args.fuel)
-        
-        # Select planner
-        planner_map = {
-            'bfs': BFSPlanner(env),
-            'ucs': UniformCostPlanner(env),
-            'astar': AStarPlanner(env, args.heuristic),
-            'hillclimb': HillClimbingPlanner(env),
-            'annealing': SimulatedAnnealingPlanner(env)
-        }
-        
-        planner = planner_map[args.planner]
-        planner_name = {
-            'bfs': 'Breadth-First Search',
-            'ucs': 'Uniform Cost Search', 
-            'astar': 'A* Search',
-            'hillclimb': 'Hill Climbing',
-            'annealing': 'Simulated Annealing'
-        }[args.planner]
-        
-        print(f"\nUsing planner: {planner_name}")
-        if args.planner == 'astar':
-            print(f"Heuristic: {args.heuristic}")
-        
-        # Plan path
-        print("\nPlanning path...")
-        start_time = time.time()
-        path = planner.plan(start, goal)
-        planning_time = time.time() - start_time
-        
-        # Print statistics
-        print_statistics(planner_name, path, planner.nodes_expanded, planning_time, env)
-        
-        if not path:
-            print("No path found!")
-            return 1
-        
-        # Visualize if requested
-        if args.visualize:
-            visualize_path(env, path, start)
-        
-        # Execute path
-        print(f"\nExecuting path...")
-        success = agent.execute_path(path, dynamic=args.dynamic)
-        
-        # Print final status
-        status = agent.get_status()
-        print(f"\nFinal Status:")
-        print(f"Position: {status['position']}")
-        print(f"Fuel remaining: {status['fuel_remaining']}")
-        print(f"Total cost: {status['total_cost']}")
-        print(f"Time elapsed: {status['time_elapsed']}")
-        print(f"Goal reached: {status['at_goal']}")
-        
-        if args.visualize:
-            visualize_path(env, path, agent.position)
-        
-        return 0 if success else 1
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        return 1
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+"""
+Autonomous Delivery Agent Runner
+"""
+
+import argparse
+import time
+import sys
+import os
+
+# Add the project root to path so the src package is importable
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.environment import GridEnvironment
+from src.agent import DeliveryAgent
+from src.planners.uninformed import BFSPlanner, UniformCostPlanner
+from src.planners.informed import AStarPlanner, TimeDependentAStarPlanner
+from src.planners.local_search import HillClimbingPlanner, SimulatedAnnealingPlanner, GeneticPlanner
+from src.planners.memory_bounded import FrontierAStarPlanner
+from src.planners.contraction import ContractionHierarchyPlanner
+from src.planners.realtime import RealTimePlanner
+from src.utils import load_map, print_statistics, visualize_path
+
+def run_realtime(agent, planner, args):
+    """Let the agent move while the real-time planner decides each step"""
+    if args.heuristics and os.path.exists(args.heuristics):
+        planner.load(args.heuristics)
+        print(f"Loaded learned heuristics from {args.heuristics}")
+    
+    print(f"\nMoving with lookahead {args.lookahead}...")
+    success = agent.execute_realtime(planner, dynamic=args.dynamic)
+    
+    latencies = planner.step_latencies
+    trial = planner.trials[agent.goal][-1]
+    print(f"Steps: {trial['steps']}, cost: {trial['cost']}, nodes expanded: {planner.nodes_expanded}")
+    if latencies:
+        print(f"Step latency: first {planner.first_move_latency * 1000:.3f} ms "
+              f"(setup {planner.setup_latency * 1000:.3f} ms), "
+              f"mean {sum(latencies) / len(latencies) * 1000:.3f} ms, "
+              f"max {planner.max_step_latency * 1000:.3f} ms")
+    print(f"Heuristic increase this run: {trial['heuristic_change']:.1f} "
+          f"(run {len(planner.trials[agent.goal])}, 0 means converged)")
+    
+    if args.heuristics:
+        planner.save(args.heuristics)
+    
+    status = agent.get_status()
+    print(f"\nFinal Status:")
+    print(f"Position: {status['position']}")
+    print(f"Fuel remaining: {status['fuel_remaining']}")
+    print(f"Total cost: {status['total_cost']}")
+    print(f"Time elapsed: {status['time_elapsed']}")
+    print(f"Goal reached: {status['at_goal']}")
+    return 0 if success else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Autonomous Delivery Agent')
+    parser.add_argument('map_file', help='Path to the map file')
+    parser.add_argument('--planner', choices=['bfs', 'ucs', 'astar', 'hillclimb', 'annealing', 'genetic', 'frontier', 'ch', 'realtime', 'timed'],
+                       default='astar', help='Path planning algorithm')
+    parser.add_argument('--heuristic', choices=['manhattan', 'euclidean', 'chebyshev'],
+                       default='manhattan', help='Heuristic for A*')
+    parser.add_argument('--dynamic', action='store_true', help='Enable dynamic obstacles')
+    parser.add_argument('--visualize', action='store_true', help='Show visualization')
+    parser.add_argument('--fuel', type=int, default=1000, help='Initial fuel amount')
+    parser.add_argument('--open-list', choices=['binary', 'indexed', 'bucket', 'radix'],
+                       default='binary', help='Open list implementation for UCS and A*')
+    parser.add_argument('--memory-budget', type=int, default=None,
+                       help='Memory budget in bytes for the frontier planner')
+    parser.add_argument('--max-expansions', type=int, default=None,
+                       help='Expansion budget for the frontier planner')
+    parser.add_argument('--ch-cache', default=None,
+                       help='Directory for cached contraction hierarchies')
+    parser.add_argument('--time-budget', type=float, default=2.0,
+                       help='Time budget in seconds for the genetic planner')
+    parser.add_argument('--lookahead', type=int, default=32,
+                       help='Expansions per step for the real-time planner')
+    parser.add_argument('--heuristics', default=None,
+                       help='File to load and save learned real-time heuristics')
+    parser.add_argument('--start-time', type=float, default=0,
+                       help='Departure time for the time-dependent planner')
+    
+    args = parser.parse_args()
+    if args.planner == 'timed' and args.open_list != 'binary':
+        parser.error("--planner timed always uses the binary open list")
+    
+    if not os.path.exists(args.map_file):
+        print(f"Error: Map file '{args.map_file}' not found")
+        return 1
+    
+    try:
+        # Load environment and positions
+        env, start, goal = load_map(args.map_file)
+        
+        print(f"Loaded map: {args.map_file}")
+        print(f"Grid size: {env.width} x {env.height}")
+        print(f"Start: {start}, Goal: {goal}")
+        
+        # Create agent
+        agent = DeliveryAgent(start, goal, env, fuel=args.fuel)
+        
+        # Select planner
+        planner_map = {
+            'bfs': BFSPlanner(env),
+            'ucs': UniformCostPlanner(env, args.open_list),
+            'astar': AStarPlanner(env, args.heuristic, args.open_list),
+            'hillclimb': HillClimbingPlanner(env),
+            'annealing': SimulatedAnnealingPlanner(env),
+            'genetic': GeneticPlanner(env, time_budget=args.time_budget),
+            'frontier': FrontierAStarPlanner(env, args.heuristic, max_bytes=args.memory_budget,
+                                             max_expansions=args.max_expansions),
+            'ch': ContractionHierarchyPlanner(env, cache_dir=args.ch_cache),
+            'realtime': RealTimePlanner(env, lookahead=args.lookahead),
+            'timed': TimeDependentAStarPlanner(env, args.heuristic, start_time=args.start_time)
+        }
+        
+        planner = planner_map[args.planner]
+        planner_name = {
+            'bfs': 'Breadth-First Search',
+            'ucs': 'Uniform Cost Search', 
+            'astar': 'A* Search',
+            'hillclimb': 'Hill Climbing',
+            'annealing': 'Simulated Annealing',
+            'genetic': 'Genetic Algorithm',
+            'frontier': 'Memory-Bounded Frontier A*',
+            'ch': 'Contraction Hierarchies',
+            'realtime': 'Real-Time A* (RTAA*)',
+            'timed': 'Time-Dependent A*'
+        }[args.planner]
+        
+        print(f"\nUsing planner: {planner_name}")
+        if args.planner in ('astar', 'frontier', 'timed'):
+            print(f"Heuristic: {args.heuristic}")
+        
+        if args.planner == 'ch':
+            planner.prepare()
+            source = 'loaded from cache' if planner.loaded_from_cache else 'built'
+            print(f"Hierarchy {source} in {planner.preprocessing_time:.2f} seconds "
+                  f"({planner.index_size:,} bytes, {planner.hierarchy.num_shortcuts:,} shortcuts)")
+        
+        if args.planner == 'realtime':
+            return run_realtime(agent, planner, args)
+        
+        # Plan path
+        print("\nPlanning path...")
+        start_time = time.time()
+        path = planner.plan(start, goal)
+        planning_time = time.time() - start_time
+        
+        # Print statistics
+        total_cost = None
+        if args.planner == 'timed' and path:
+            # Cost of every move at the time it is made, waiting excluded
+            total_cost = sum(a - d for a, d in zip(planner.arrival_times[1:], planner.departure_times))
+        print_statistics(planner_name, path, planner.nodes_expanded, planning_time, env, total_cost)
+        if args.planner == 'frontier':
+            print(f"Peak open nodes: {planner.peak_nodes} (~{planner.peak_memory} bytes)")
+            if planner.pruned:
+                print("Memory budget reached: open list was pruned, path may be suboptimal")
+            if planner.retries:
+                print(f"Pruned search kept re-expanding; budget relaxed {planner.retries} times "
+                      f"to {planner.node_budget} nodes")
+        if args.planner == 'timed' and path:
+            waits = sum(d - a for a, d in zip(planner.arrival_times, planner.departure_times))
+            print(f"Departure: {args.start_time}, arrival: {planner.arrival_times[-1]} "
+                  f"(waiting {waits} in total)")
+        if args.planner == 'ch':
+            comparison = planner.compare_with_astar([(start, goal)], args.heuristic)
+            print(f"Speedup over A*: {comparison['speedup']:.1f}x "
+                  f"({comparison['ch_time'] * 1000:.3f} ms vs {comparison['astar_time'] * 1000:.3f} ms)")
+        
+        if not path:
+            if getattr(planner, 'budget_exhausted', False):
+                print(f"Expansion budget of {planner.max_expansions} exhausted before reaching the goal")
+            else:
+                print("No path found!")
+            return 1
+        
+        # Visualize if requested
+        if args.visualize:
+            visualize_path(env, path, start)
+        
+        # Execute path
+        print(f"\nExecuting path...")
+        if args.planner == 'timed':
+            success = agent.execute_timed(path, planner.arrival_times, planner.departure_times)
+        else:
+            success = agent.execute_path(path, dynamic=args.dynamic)
+        
+        # Print final status
+        status = agent.get_status()
+        print(f"\nFinal Status:")
+        print(f"Position: {status['position']}")
+        print(f"Fuel remaining: {status['fuel_remaining']}")
+        print(f"Total cost: {status['total_cost']}")
+        print(f"Time elapsed: {status['time_elapsed']}")
+        print(f"Goal reached: {status['at_goal']}")
+        
+        if args.visualize:
+            visualize_path(env, path, agent.position)
+        
+        return 0 if success else 1
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,13 +1,26 @@
-# Package initialization
-from .environment import GridEnvironment, Terrain, Cell, MovingObstacle
-from .agent import DeliveryAgent, Planner
-from .planners.uninformed import BFSPlanner, UniformCostPlanner
-from .planners.informed import AStarPlanner
-from .planners.local_search import HillClimbingPlanner, SimulatedAnnealingPlanner
-
-__all__ = [
-    'GridEnvironment', 'Terrain', 'Cell', 'MovingObstacle',
-    'DeliveryAgent', 'Planner',
-    'BFSPlanner', 'UniformCostPlanner', 'AStarPlanner',
-    'HillClimbingPlanner', 'SimulatedAnnealingPlanner'
+# Package initialization
+from .environment import GridEnvironment, Terrain, Cell, MovingObstacle
+from .agent import DeliveryAgent, Planner
+from .trajectory import CompactPath, RingBufferHistory, FileHistory
+from .simulation import ObstacleSchedule, Scenario, SimulationEngine
+from .mapgen import CityMapGenerator
+from .connectivity import ConnectivityIndex
+from .planners.uninformed import BFSPlanner, UniformCostPlanner
+from .planners.informed import AStarPlanner, TimeDependentAStarPlanner
+from .planners.local_search import HillClimbingPlanner, SimulatedAnnealingPlanner, GeneticPlanner
+from .planners.memory_bounded import FrontierAStarPlanner
+from .planners.contraction import ContractionHierarchy, ContractionHierarchyPlanner
+from .planners.realtime import RealTimePlanner
+
+__all__ = [
+    'GridEnvironment', 'Terrain', 'Cell', 'MovingObstacle',
+    'DeliveryAgent', 'Planner',
+    'CompactPath', 'RingBufferHistory', 'FileHistory',
+    'ObstacleSchedule', 'Scenario', 'SimulationEngine',
+    'CityMapGenerator', 'ConnectivityIndex',
+    'BFSPlanner', 'UniformCostPlanner', 'AStarPlanner', 'TimeDependentAStarPlanner',
+    'HillClimbingPlanner', 'SimulatedAnnealingPlanner', 'GeneticPlanner',
+    'FrontierAStarPlanner',
+    'ContractionHierarchy', 'ContractionHierarchyPlanner',
+    'RealTimePlanner'
 ]
\ No newline at end of file
@@ -1,99 +1,179 @@
-from typing import List, Tuple, Dict, Optional
-from abc import ABC, abstractmethod
-from .environment import GridEnvironment
-
-class Planner(ABC):
-    def __init__(self, environment: GridEnvironment):
-        self.environment = environment
-        self.nodes_expanded = 0
-    
-    @abstractmethod
-    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-        pass
-    
-    def reconstruct_path(self, came_from: Dict[Tuple[int, int], Tuple[int, int]], 
-                        current: Tuple[int, int]) -> List[Tuple[int, int]]:
-        path = [current]
-        while current in came_from and came_from[current] is not None:
-            current = came_from[current]
-            path.append(current)
-        return path[::-1]
-
-class DeliveryAgent:
-    def __init__(self, start: Tuple[int, int], goal: Tuple[int, int], 
-                 environment: GridEnvironment, fuel: int = 1000):
-        self.start_position = start
-        self.position = start
-        self.goal = goal
-        self.environment = environment
-        self.initial_fuel = fuel
-        self.fuel = fuel
-        self.path: List[Tuple[int, int]] = []
-        self.total_cost = 0
-        self.time_elapsed = 0
-        self.history: List[Tuple[int, int]] = [start]
-        
-    def move(self, new_position: Tuple[int, int], time: int = None) -> bool:
-        x, y = new_position
-        move_cost = self.environment.get_cost(x, y, time)
-        
-        if (self.environment.is_valid_position(x, y, time) and 
-            self.fuel >= move_cost and 
-            self._is_adjacent(self.position, new_position)):
-            
-            self.position = new_position
-            self.fuel -= move_cost
-            self.total_cost += move_cost
-            self.time_elapsed += 1
-            self.history.append(new_position)
-            return True
-        return False
-    
-    def _is_adjacent(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
-        x1, y1 = pos1
-        x2, y2 = pos2
-        return abs(x1 - x2) + abs(y1 - y2) == 1
-    
-    def has_reached_goal(self) -> bool:
-        return self.position == self.goal
-    
-    def get_path_cost(self, path: List[Tuple[int, int]]) -> float:
-        if len(path) < 2:
-            return 0
-        
-        total_cost = 0
-        for i in range(len(path) - 1):
-            x1, y1 = path[i]
-            x2, y2 = path[i + 1]
-            total_cost += self.environment.get_cost(x2, y2)
-        return total_cost
-    
-    def execute_path(self, path: List[Tuple[int, int]], dynamic: bool = False) -> bool:
-        """Execute a planned path, handling dynamic obstacles if needed"""
-        if not path or path[0] != self.position:
-            return False
-        
-        for i, next_pos in enumerate(path[1:], 1):
-            if dynamic:
-                self.environment.update_dynamic_obstacles()
-            
-            success = self.move(next_pos, self.time_elapsed if dynamic else None)
-            
-            if not success:
-                print(f"Movement blocked at step {i}! Replanning needed.")
-                return False
-            
-            if self.has_reached_goal():
-                print("Goal reached successfully!")
-                return True
-        
-        return self.has_reached_goal()
-    
-    def get_status(self) -> Dict:
-        return {
-            'position': self.position,
-            'fuel_remaining': self.fuel,
-            'total_cost': self.total_cost,
-            'time_elapsed': self.time_elapsed,
-            'at_goal': self.has_reached_goal()
+from typing import List, Tuple, Dict, Optional, Sequence
+from abc import ABC, abstractmethod
+import numpy as np
+from .environment import GridEnvironment
+from .trajectory import CompactPath
+
+class Planner(ABC):
+    def __init__(self, environment: GridEnvironment, prune_dead_ends: bool = False):
+        self.environment = environment
+        self.nodes_expanded = 0
+        self.prune_dead_ends = prune_dead_ends
+    
+    @abstractmethod
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        pass
+    
+    def is_reachable(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """O(1) check that start and goal share a connected component"""
+        return self.environment.connectivity.is_reachable(start, goal)
+    
+    def dead_end_cells(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[np.ndarray]:
+        """Boolean [y, x] mask of cells the search may skip, if pruning is enabled"""
+        if not self.prune_dead_ends:
+            return None
+        return self.environment.connectivity.dead_end_mask(keep=(start, goal))
+    
+    def reconstruct_path(self, came_from: Dict[Tuple[int, int], Tuple[int, int]], 
+                        current: Tuple[int, int]) -> List[Tuple[int, int]]:
+        path = [current]
+        while current in came_from and came_from[current] is not None:
+            current = came_from[current]
+            path.append(current)
+        return path[::-1]
+
+class DeliveryAgent:
+    def __init__(self, start: Tuple[int, int], goal: Tuple[int, int], 
+                 environment: GridEnvironment, fuel: int = 1000, history=None):
+        self.start_position = start
+        self.position = start
+        self.goal = goal
+        self.environment = environment
+        self.initial_fuel = fuel
+        self.fuel = fuel
+        self.path: List[Tuple[int, int]] = []
+        self.total_cost = 0
+        self.time_elapsed = 0
+        # A plain list by default; any append-able sequence works here, e.g.
+        # CompactPath, RingBufferHistory or FileHistory to bound memory on
+        # long runs
+        if history is None:
+            history = [start]
+        elif len(history) == 0:
+            history.append(start)
+        self.history: Sequence[Tuple[int, int]] = history
+        
+    def move(self, new_position: Tuple[int, int], time: int = None) -> bool:
+        x, y = new_position
+        move_cost = self.environment.get_cost(x, y, time)
+        
+        if (self.environment.is_valid_position(x, y, time) and 
+            self.fuel >= move_cost and 
+            self._is_adjacent(self.position, new_position)):
+            
+            self.position = new_position
+            self.fuel -= move_cost
+            self.total_cost += move_cost
+            self.time_elapsed += 1
+            self.history.append(new_position)
+            return True
+        return False
+    
+    def _is_adjacent(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
+        x1, y1 = pos1
+        x2, y2 = pos2
+        return abs(x1 - x2) + abs(y1 - y2) == 1
+    
+    def has_reached_goal(self) -> bool:
+        return self.position == self.goal
+    
+    def get_path_cost(self, path: Sequence[Tuple[int, int]]) -> float:
+        if len(path) < 2:
+            return 0
+        
+        if isinstance(path, CompactPath):
+            return path.cost(self.environment)
+        
+        total_cost = 0
+        for i in range(len(path) - 1):
+            x1, y1 = path[i]
+            x2, y2 = path[i + 1]
+            total_cost += self.environment.get_cost(x2, y2)
+        return total_cost
+    
+    def execute_path(self, path: Sequence[Tuple[int, int]], dynamic: bool = False) -> bool:
+        """Execute a planned path, handling dynamic obstacles if needed"""
+        if not path or path[0] != self.position:
+            return False
+        
+        for i, next_pos in enumerate(path[1:], 1):
+            if dynamic:
+                self.environment.update_dynamic_obstacles()
+            
+            success = self.move(next_pos, self.time_elapsed if dynamic else None)
+            
+            if not success:
+                print(f"Movement blocked at step {i}! Replanning needed.")
+                return False
+            
+            if self.has_reached_goal():
+                print("Goal reached successfully!")
+                return True
+        
+        return self.has_reached_goal()
+    
+    def execute_timed(self, path: Sequence[Tuple[int, int]], arrival_times: Sequence[float],
+                      departure_times: Sequence[float]) -> bool:
+        """Follow a time-dependent plan, e.g. from TimeDependentAStarPlanner.
+        
+        Each move costs its cost at the time it is made (arrival minus
+        departure), waiting costs time but no fuel, and time_elapsed advances
+        with the planned arrival times.
+        """
+        if not path or path[0] != self.position:
+            return False
+        
+        elapsed = self.time_elapsed - arrival_times[0]
+        for i in range(1, len(path)):
+            next_pos = path[i]
+            move_cost = arrival_times[i] - departure_times[i - 1]
+            if not (self.environment.is_valid_position(*next_pos) and
+                    self.fuel >= move_cost and
+                    self._is_adjacent(self.position, next_pos)):
+                print(f"Movement blocked at step {i}!")
+                return False
+            
+            self.position = next_pos
+            self.fuel -= move_cost
+            self.total_cost += move_cost
+            self.time_elapsed = elapsed + arrival_times[i]
+            self.history.append(next_pos)
+        
+        if self.has_reached_goal():
+            print("Goal reached successfully!")
+        return self.has_reached_goal()
+    
+    def execute_realtime(self, planner, dynamic: bool = False) -> bool:
+        """Move as a real-time planner decides, one step at a time.
+        
+        `planner.steps()` must yield the next cell for each step (the
+        current cell means wait), e.g. RealTimePlanner. The first move is
+        made as soon as the first step has been decided.
+        """
+        steps = planner.steps(self.position, self.goal, self.time_elapsed if dynamic else None)
+        for i, next_pos in enumerate(steps, 1):
+            if dynamic:
+                self.environment.update_dynamic_obstacles()
+            
+            if next_pos == self.position:
+                self.time_elapsed += 1  # Let a moving obstacle pass
+                continue
+            
+            if not self.move(next_pos, self.time_elapsed if dynamic else None):
+                print(f"Movement blocked at step {i}!")
+                return False
+            
+            if self.has_reached_goal():
+                print("Goal reached successfully!")
+                return True
+        
+        return self.has_reached_goal()
+    
+    def get_status(self) -> Dict:
+        return {
+            'position': self.position,
+            'fuel_remaining': self.fuel,
+            'total_cost': self.total_cost,
+            'time_elapsed': self.time_elapsed,
+            'at_goal': self.has_reached_goal()
         }
\ No newline at end of file
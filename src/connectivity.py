@@ -0,0 +1,184 @@
+from collections import deque
+from typing import Dict, Iterable, Set, Tuple
+
+import numpy as np
+
+def label_components(passable: np.ndarray) -> np.ndarray:
+    """Label 4-connected components of a boolean (height, width) grid.
+
+    Each passable cell gets the flat index of the smallest cell in its
+    component, impassable cells get -1. Works by repeatedly hooking the
+    larger root of every edge onto the smaller one and compressing all
+    pointers, which needs only a handful of vectorized rounds.
+    """
+    height, width = passable.shape
+    labels = np.arange(height * width, dtype=np.int64)
+    index = labels.reshape(height, width)
+
+    horizontal = passable[:, :-1] & passable[:, 1:]
+    vertical = passable[:-1, :] & passable[1:, :]
+    a = np.concatenate([index[:, :-1][horizontal], index[:-1, :][vertical]])
+    b = np.concatenate([index[:, 1:][horizontal], index[1:, :][vertical]])
+
+    while len(a):
+        la, lb = labels[a], labels[b]
+        differ = la != lb
+        if not differ.any():
+            break
+        a, b, la, lb = a[differ], b[differ], la[differ], lb[differ]
+        np.minimum.at(labels, np.maximum(la, lb), np.minimum(la, lb))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    labels = labels.reshape(height, width)
+    labels[~passable] = -1
+    return labels
+
+class ConnectivityIndex:
+    """Connected components of the passable cells of a GridEnvironment.
+
+    Answers reachability queries in O(1). Cells that become passable are
+    merged into their neighbours' components with a small union-find;
+    cells that become blocked only force a rebuild when they might split a
+    component, and that rebuild is deferred until the next query.
+    """
+
+    def __init__(self, environment):
+        self.environment = environment
+        self.rebuilds = 0
+        self.rebuild()
+
+    def rebuild(self):
+        self.labels = label_components(np.isfinite(self.environment.cost_array))
+        self._parent: Dict[int, int] = {}
+        self._next_id = self.labels.size  # Ids for cells opened after the build
+        self._dirty = False
+        self.rebuilds += 1
+
+    def _find(self, component: int) -> int:
+        root = component
+        while root in self._parent:
+            root = self._parent[root]
+        while component != root:
+            self._parent[component], component = root, self._parent[component]
+        return root
+
+    def _neighbors(self, x: int, y: int) -> Iterable[Tuple[int, int]]:
+        for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.environment.width and 0 <= ny < self.environment.height:
+                yield nx, ny
+
+    def component(self, x: int, y: int) -> int:
+        """Component id of a cell, or -1 if it is blocked or off the grid"""
+        if self._dirty:
+            self.rebuild()
+        if not (0 <= x < self.environment.width and 0 <= y < self.environment.height):
+            return -1
+        label = int(self.labels[y, x])
+        return self._find(label) if label >= 0 else -1
+
+    def connected(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        ca = self.component(*a)
+        return ca >= 0 and ca == self.component(*b)
+
+    def is_reachable(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """Whether goal can be reached from start, ignoring moving obstacles.
+
+        Only the cells entered must be passable, so a start cell that is
+        itself blocked can still leave through any passable neighbour.
+        """
+        target = self.component(*goal)
+        if target < 0:
+            return False
+        if self.component(*start) == target:
+            return True
+        return any(self.component(nx, ny) == target for nx, ny in self._neighbors(*start))
+
+    def cell_changed(self, x: int, y: int, was_passable: bool, now_passable: bool):
+        """Update the index after the passability of one cell was edited"""
+        if now_passable == was_passable or self._dirty:
+            return
+
+        if now_passable:
+            # Joining never splits anything: merge the neighbouring components
+            own = self._next_id
+            self._next_id += 1
+            self.labels[y, x] = own
+            for nx, ny in self._neighbors(x, y):
+                label = self.labels[ny, nx]
+                if label >= 0:
+                    root = self._find(int(label))
+                    if root != own:
+                        self._parent[root] = own
+            return
+
+        self.labels[y, x] = -1
+        if not self._removal_is_local(x, y):
+            self._dirty = True  # The cut may split a component; rebuild lazily
+
+    def _removal_is_local(self, x: int, y: int) -> bool:
+        """True if the open neighbours of (x, y) stay linked around its 3x3 ring"""
+        # Ring in circular order; odd positions are the 4-connected neighbours
+        ring = [(x - 1, y - 1), (x, y - 1), (x + 1, y - 1), (x + 1, y),
+                (x + 1, y + 1), (x, y + 1), (x - 1, y + 1), (x - 1, y)]
+        open_ring = [0 <= cx < self.environment.width and 0 <= cy < self.environment.height
+                     and self.labels[cy, cx] >= 0 for cx, cy in ring]
+        if all(open_ring):
+            return True
+
+        # Count runs of consecutive open ring cells that touch a neighbour
+        first_closed = open_ring.index(False)
+        runs = 0
+        in_run = touches_side = False
+        for step in range(1, 9):
+            i = (first_closed + step) % 8
+            if open_ring[i]:
+                if not in_run:
+                    in_run, touches_side = True, False
+                touches_side = touches_side or i % 2 == 1
+            else:
+                if in_run and touches_side:
+                    runs += 1
+                in_run = False
+        return runs <= 1
+
+    def dead_end_mask(self, keep: Iterable[Tuple[int, int]] = ()) -> np.ndarray:
+        """Cells in dead-end corridors and tree-shaped pockets.
+
+        Repeatedly removes passable cells with at most one passable
+        neighbour, never removing the cells in `keep` (start and goal). No
+        shortest path between kept cells passes through a removed cell.
+        """
+        if self._dirty:
+            self.rebuild()
+        protected: Set[Tuple[int, int]] = set(keep)
+        alive = self.labels >= 0
+        for x, y in protected:
+            # A blocked start still anchors the cells it can step into
+            if 0 <= x < self.environment.width and 0 <= y < self.environment.height:
+                alive[y, x] = True
+        degree = np.zeros(alive.shape, dtype=np.int8)
+        degree[:, :-1] += alive[:, 1:]
+        degree[:, 1:] += alive[:, :-1]
+        degree[:-1, :] += alive[1:, :]
+        degree[1:, :] += alive[:-1, :]
+
+        ys, xs = np.nonzero(alive & (degree <= 1))
+        queue = deque(zip(xs.tolist(), ys.tolist()))
+        removed = np.zeros(alive.shape, dtype=bool)
+
+        while queue:
+            x, y = queue.popleft()
+            if removed[y, x] or (x, y) in protected or degree[y, x] > 1:
+                continue
+            removed[y, x] = True
+            for nx, ny in self._neighbors(x, y):
+                if alive[ny, nx] and not removed[ny, nx]:
+                    degree[ny, nx] -= 1
+                    if degree[ny, nx] <= 1:
+                        queue.append((nx, ny))
+        return removed
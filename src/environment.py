@@ -1,210 +1,376 @@
-import numpy as np
-from enum import Enum
-from typing import List, Tuple, Dict, Optional
-
-class Terrain(Enum):
-    ROAD = 1
-    GRASS = 3
-    SAND = 5
-    WATER = 10  # Unpassable
-
-class Cell:
-    def __init__(self, terrain: Terrain = Terrain.ROAD, is_obstacle: bool = False):
-        self.terrain = terrain
-        self.is_obstacle = is_obstacle
-        self.dynamic_obstacle = False
-        self.update_cost()
-    
-    def update_cost(self):
-        if self.is_obstacle:
-            self.cost = float('inf')
-        else:
-            self.cost = self.terrain.value
-    
-    def set_dynamic_obstacle(self, is_obstacle: bool):
-        self.dynamic_obstacle = is_obstacle
-        self.update_cost()
-
-class MovingObstacle:
-    def __init__(self, path: List[Tuple[int, int]], speed: int = 1):
-        self.path = path
-        self.speed = speed
-        self.current_step = 0
-        self.position_index = 0
-    
-    def get_position_at_time(self, time_step: int) -> Tuple[int, int]:
-        effective_step = (time_step // self.speed) % len(self.path)
-        return self.path[effective_step]
-    
-    def update(self, time_step: int) -> Tuple[int, int]:
-        self.current_step = time_step
-        self.position_index = (time_step // self.speed) % len(self.path)
-        return self.path[self.position_index]
-
-class GridEnvironment:
-    def __init__(self, width: int, height: int):
-        self.width = width
-        self.height = height
-        self.grid = np.empty((height, width), dtype=object)
-        self.moving_obstacles: List[MovingObstacle] = []
-        self.time_step = 0
-        
-        # Initialize grid with default terrain
-        for y in range(height):
-            for x in range(width):
-                self.grid[y][x] = Cell(Terrain.ROAD)
-    
-    def set_terrain(self, x: int, y: int, terrain: Terrain):
-        if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x].terrain = terrain
-            self.grid[y][x].update_cost()
-    
-    def set_static_obstacle(self, x: int, y: int):
-        if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x].is_obstacle = True
-            self.grid[y][x].update_cost()
-    
-    def add_moving_obstacle(self, path: List[Tuple[int, int]], speed: int = 1):
-        obstacle = MovingObstacle(path, speed)
-        self.moving_obstacles.append(obstacle)
-    
-    def update_dynamic_obstacles(self):
-        """Update positions of moving obstacles for current time step"""
-        self.time_step += 1
-        
-        # Clear previous dynamic obstacles
-        for y in range(self.height):
-            for x in range(self.width):
-                self.grid[y][x].set_dynamic_obstacle(False)
-        
-        # Set new dynamic obstacle positions
-        for obstacle in self.moving_obstacles:
-            x, y = obstacle.update(self.time_step)
-            if 0 <= x < self.width and 0 <= y < self.height:
-                self.grid[y][x].set_dynamic_obstacle(True)
-    
-    def get_cost(self, x: int, y: int, time: int = None) -> float:
-        if not (0 <= x < self.width and 0 <= y < self.height):
-            return float('inf')
-        
-        cell = self.grid[y][x]
-        
-        # Check if cell is blocked at the given time
-        if time is not None:
-            for obstacle in self.moving_obstacles:
-                obs_x, obs_y = obstacle.get_position_at_time(time)
-                if (x, y) == (obs_x, obs_y):
-                    return float('inf')
-        
-        return cell.cost
-    
-    def is_valid_position(self, x: int, y: int, time: int = None) -> bool:
-        return self.get_cost(x, y, time) < float('inf')
-    
-    def get_neighbors(self, x: int, y: int, time: int = None) -> List[Tuple[int, int, int]]:
-        neighbors = []
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # 4-connected movement
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.width and 0 <= ny < self.height:
-                cost = self.get_cost(nx, ny, time)
-                if cost < float('inf'):
-                    neighbors.append((nx, ny, cost))
-        
-        return neighbors
-
-    def load_from_file(self, filename: str):
-        terrain_map = {
-            'R': Terrain.ROAD,
-            'G': Terrain.GRASS,
-            'S': Terrain.SAND,
-            'W': Terrain.WATER,
-            'X': 'OBSTACLE'
-        }
-        
-        with open(filename, 'r') as f:
-            lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-        
-        if len(lines) < 3:
-            raise ValueError("Map file must have at least 3 lines")
-        
-        # Parse dimensions
-        dims = lines[0].split()
-        if len(dims) != 2:
-            raise ValueError("First line must contain two integers: width height")
-        
-        width, height = int(dims[0]), int(dims[1])
-        
-        # Resize grid if necessary
-        if width != self.width or height != self.height:
-            self.__init__(width, height)
-        
-        # Parse start and goal
-        positions = lines[1].split()
-        if len(positions) != 4:
-            raise ValueError("Second line must contain four integers: start_x start_y goal_x goal_y")
-        
-        start_x, start_y, goal_x, goal_y = map(int, positions)
-        
-        # Parse grid
-        grid_lines = lines[2:2+height]
-        if len(grid_lines) < height:
-            raise ValueError(f"Expected {height} grid lines, got {len(grid_lines)}")
-        
-        for y, line in enumerate(grid_lines):
-            if len(line) != width:
-                raise ValueError(f"Line {y+3} has length {len(line)}, expected {width}")
-            
-            for x, char in enumerate(line):
-                if char in terrain_map:
-                    if char == 'X':
-                        self.set_static_obstacle(x, y)
-                    else:
-                        self.set_terrain(x, y, terrain_map[char])
-        
-        # Parse moving obstacles if present
-        for line in lines[2+height:]:
-            if line.startswith('MOVING'):
-                parts = line.split()
-                if len(parts) >= 3:
-                    speed = int(parts[1])
-                    path = []
-                    for i in range(2, len(parts), 2):
-                        if i+1 < len(parts):
-                            x, y = int(parts[i]), int(parts[i+1])
-                            path.append((x, y))
-                    if path:
-                        self.add_moving_obstacle(path, speed)
-        
-        return (start_x, start_y), (goal_x, goal_y)
-
-    def visualize(self, agent_pos: Tuple[int, int] = None, path: List[Tuple[int, int]] = None):
-        """Simple text visualization of the grid"""
-        symbols = {
-            Terrain.ROAD: '.',
-            Terrain.GRASS: 'g',
-            Terrain.SAND: 's',
-            Terrain.WATER: '~'
-        }
-        
-        print("\n" + "=" * (self.width * 2 + 1))
-        for y in range(self.height):
-            row = "|"
-            for x in range(self.width):
-                cell = self.grid[y][x]
-                
-                if agent_pos and (x, y) == agent_pos:
-                    row += "A|"
-                elif path and (x, y) in path:
-                    index = path.index((x, y))
-                    row += f"{index % 10}|"
-                elif cell.is_obstacle:
-                    row += "X|"
-                elif cell.dynamic_obstacle:
-                    row += "D|"
-                else:
-                    symbol = symbols.get(cell.terrain, '?')
-                    row += f"{symbol}|"
-            print(row)
+import numpy as np
+from enum import Enum
+from typing import List, Tuple, Dict, Optional
+from .connectivity import ConnectivityIndex
+
+class Terrain(Enum):
+    ROAD = 1
+    GRASS = 3
+    SAND = 5
+    WATER = 10  # Unpassable
+
+class Cell:
+    def __init__(self, terrain: Terrain = Terrain.ROAD, is_obstacle: bool = False):
+        self.terrain = terrain
+        self.is_obstacle = is_obstacle
+        self.dynamic_obstacle = False
+        self.update_cost()
+    
+    def update_cost(self):
+        if self.is_obstacle:
+            self.cost = float('inf')
+        else:
+            self.cost = self.terrain.value
+    
+    def set_dynamic_obstacle(self, is_obstacle: bool):
+        self.dynamic_obstacle = is_obstacle
+        self.update_cost()
+
+class MovingObstacle:
+    def __init__(self, path: List[Tuple[int, int]], speed: int = 1):
+        self.path = path
+        self.speed = speed
+        self.current_step = 0
+        self.position_index = 0
+    
+    def get_position_at_time(self, time_step: int) -> Tuple[int, int]:
+        effective_step = (time_step // self.speed) % len(self.path)
+        return self.path[effective_step]
+    
+    def update(self, time_step: int) -> Tuple[int, int]:
+        self.current_step = time_step
+        self.position_index = (time_step // self.speed) % len(self.path)
+        return self.path[self.position_index]
+
+class GridEnvironment:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.grid = np.empty((height, width), dtype=object)
+        self.moving_obstacles: List[MovingObstacle] = []
+        self.time_step = 0
+        self._cost_array = None
+        self.revision = 0  # Bumped on every static cell edit so caches can spot stale data
+        self._connectivity: Optional[ConnectivityIndex] = None
+        self._dynamic_cells: List[Tuple[int, int]] = []
+        # Set by a Scenario that keeps obstacle occupancy in its own array
+        self.dynamic_flag_source = None
+        self._occupied_cache: Tuple[Optional[int], set] = (None, set())
+        # Time-dependent costs: cost multiplier layers and a cyclic schedule
+        # of layer indexes, one per slot of `slot_length` time units
+        self.cost_layers: List[np.ndarray] = []
+        self.layer_names: List[str] = []
+        self.layer_schedule: List[int] = []
+        self.slot_length = 1
+        
+        # Initialize grid with default terrain
+        for y in range(height):
+            for x in range(width):
+                self.grid[y][x] = Cell(Terrain.ROAD)
+    
+    def set_terrain(self, x: int, y: int, terrain: Terrain):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            was_passable = self.grid[y][x].cost < float('inf')
+            self.grid[y][x].terrain = terrain
+            self.grid[y][x].update_cost()
+            self._cell_updated(x, y, was_passable)
+    
+    def set_static_obstacle(self, x: int, y: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            was_passable = self.grid[y][x].cost < float('inf')
+            self.grid[y][x].is_obstacle = True
+            self.grid[y][x].update_cost()
+            self._cell_updated(x, y, was_passable)
+    
+    def _cell_updated(self, x: int, y: int, was_passable: bool):
+        """Keep derived indexes in step with an edited cell"""
+        cost = self.grid[y][x].cost
+        self.revision += 1
+        if self._cost_array is not None:
+            self._cost_array[y, x] = cost
+        if self._connectivity is not None:
+            self._connectivity.cell_changed(x, y, was_passable, cost < float('inf'))
+    
+    def add_moving_obstacle(self, path: List[Tuple[int, int]], speed: int = 1):
+        obstacle = MovingObstacle(path, speed)
+        self.moving_obstacles.append(obstacle)
+        self._occupied_cache = (None, set())
+    
+    def update_dynamic_obstacles(self):
+        """Update positions of moving obstacles for current time step"""
+        self.time_step += 1
+        self.dynamic_flag_source = None
+        
+        # Clear previous dynamic obstacles (only the cells we marked)
+        for x, y in self._dynamic_cells:
+            self.grid[y][x].set_dynamic_obstacle(False)
+        self._dynamic_cells = []
+        
+        # Set new dynamic obstacle positions
+        for obstacle in self.moving_obstacles:
+            x, y = obstacle.update(self.time_step)
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self.grid[y][x].set_dynamic_obstacle(True)
+                self._dynamic_cells.append((x, y))
+    
+    def occupied_cells(self, time: int) -> set:
+        """Cells covered by moving obstacles at the given time (cached per time)"""
+        cached_time, cells = self._occupied_cache
+        if cached_time != time:
+            cells = {obstacle.get_position_at_time(time) for obstacle in self.moving_obstacles}
+            self._occupied_cache = (time, cells)
+        return cells
+    
+    @property
+    def cost_array(self) -> np.ndarray:
+        """Static cell costs as a (height, width) float array, indexed [y, x]"""
+        if self._cost_array is None:
+            self._cost_array = np.array(
+                [[cell.cost for cell in row] for row in self.grid], dtype=float
+            ).reshape(self.height, self.width)
+        return self._cost_array
+    
+    def add_cost_layer(self, name: str, factors: Optional[np.ndarray] = None) -> int:
+        """Register a (height, width) array of cost multipliers and return its index"""
+        if factors is None:
+            factors = np.ones((self.height, self.width))
+        factors = np.asarray(factors, dtype=float)
+        if factors.shape != (self.height, self.width):
+            raise ValueError(f"Cost layer '{name}' has shape {factors.shape}, "
+                             f"expected {(self.height, self.width)}")
+        if np.any(factors <= 0):
+            raise ValueError(f"Cost layer '{name}' must have positive factors")
+        if name in self.layer_names:
+            self.cost_layers[self.layer_names.index(name)] = factors
+            return self.layer_names.index(name)
+        self.cost_layers.append(factors)
+        self.layer_names.append(name)
+        return len(self.cost_layers) - 1
+    
+    def set_layer_schedule(self, slot_length: int, layers: List[str]):
+        """Cycle through the named layers, spending slot_length time units on each"""
+        if slot_length <= 0:
+            raise ValueError("Schedule slot length must be positive")
+        unknown = [name for name in layers if name not in self.layer_names]
+        if unknown:
+            raise ValueError(f"Unknown cost layers in schedule: {unknown}")
+        self.slot_length = slot_length
+        self.layer_schedule = [self.layer_names.index(name) for name in layers]
+    
+    def layer_at(self, time: float) -> Optional[np.ndarray]:
+        """Cost multipliers in effect at the given time, or None if costs are static"""
+        if not self.layer_schedule:
+            return None
+        slot = int(time // self.slot_length) % len(self.layer_schedule)
+        return self.cost_layers[self.layer_schedule[slot]]
+    
+    def next_slot_start(self, time: float) -> float:
+        """First time after `time` at which the schedule may switch layers"""
+        return (int(time // self.slot_length) + 1) * self.slot_length
+    
+    def get_layered_cost(self, x: int, y: int, time: float = None) -> float:
+        """Terrain cost at the given time, ignoring moving obstacles"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return float('inf')
+        cost = self.grid[y][x].cost
+        if time is not None and self.layer_schedule:
+            cost = cost * self.layer_at(time)[y, x]
+        return cost
+    
+    def cost_array_at(self, time: float) -> np.ndarray:
+        """Costs of all cells at the given time, indexed [y, x]"""
+        layer = self.layer_at(time)
+        return self.cost_array if layer is None else self.cost_array * layer
+    
+    @property
+    def connectivity(self) -> ConnectivityIndex:
+        """Component index over passable cells, built on first use"""
+        if self._connectivity is None:
+            self._connectivity = ConnectivityIndex(self)
+        return self._connectivity
+    
+    def get_cost(self, x: int, y: int, time: int = None) -> float:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return float('inf')
+        
+        cell = self.grid[y][x]
+        
+        # Check if cell is blocked at the given time
+        if time is not None and self.moving_obstacles:
+            if (x, y) in self.occupied_cells(time):
+                return float('inf')
+        
+        if time is not None and self.layer_schedule:
+            return cell.cost * self.layer_at(time)[y, x]
+        return cell.cost
+    
+    def is_valid_position(self, x: int, y: int, time: int = None) -> bool:
+        return self.get_cost(x, y, time) < float('inf')
+    
+    def get_neighbors(self, x: int, y: int, time: int = None) -> List[Tuple[int, int, int]]:
+        neighbors = []
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # 4-connected movement
+        
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                cost = self.get_cost(nx, ny, time)
+                if cost < float('inf'):
+                    neighbors.append((nx, ny, cost))
+        
+        return neighbors
+
+    def load_from_file(self, filename: str):
+        terrain_map = {
+            'R': Terrain.ROAD,
+            'G': Terrain.GRASS,
+            'S': Terrain.SAND,
+            'W': Terrain.WATER,
+            'X': 'OBSTACLE'
+        }
+        
+        with open(filename, 'r') as f:
+            lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        
+        if len(lines) < 3:
+            raise ValueError("Map file must have at least 3 lines")
+        
+        # Parse dimensions
+        dims = lines[0].split()
+        if len(dims) != 2:
+            raise ValueError("First line must contain two integers: width height")
+        
+        width, height = int(dims[0]), int(dims[1])
+        
+        # Resize grid if necessary
+        if width != self.width or height != self.height:
+            self.__init__(width, height)
+        
+        # Parse start and goal
+        positions = lines[1].split()
+        if len(positions) != 4:
+            raise ValueError("Second line must contain four integers: start_x start_y goal_x goal_y")
+        
+        start_x, start_y, goal_x, goal_y = map(int, positions)
+        
+        # Parse grid
+        grid_lines = lines[2:2+height]
+        if len(grid_lines) < height:
+            raise ValueError(f"Expected {height} grid lines, got {len(grid_lines)}")
+        
+        for y, line in enumerate(grid_lines):
+            # Rows may be written compactly ("RRGX") or space separated ("R R G X")
+            cells = line.split() if ' ' in line else line
+            if len(cells) != width:
+                raise ValueError(f"Line {y+3} has length {len(cells)}, expected {width}")
+            
+            for x, char in enumerate(cells):
+                if char in terrain_map:
+                    if char == 'X':
+                        self.set_static_obstacle(x, y)
+                    else:
+                        self.set_terrain(x, y, terrain_map[char])
+        
+        # Parse moving obstacles and time-dependent cost layers if present
+        layer_lines = []
+        for line in lines[2+height:]:
+            if line.startswith('LAYER') or line.startswith('SCHEDULE'):
+                layer_lines.append(line)
+            elif line.startswith('MOVING'):
+                parts = line.split()
+                if len(parts) >= 3:
+                    speed = int(parts[1])
+                    path = []
+                    for i in range(2, len(parts), 2):
+                        if i+1 < len(parts):
+                            x, y = int(parts[i]), int(parts[i+1])
+                            path.append((x, y))
+                    if path:
+                        self.add_moving_obstacle(path, speed)
+        
+        if layer_lines:
+            self._parse_cost_layers(layer_lines, terrain_map)
+        
+        return (start_x, start_y), (goal_x, goal_y)
+    
+    def _parse_cost_layers(self, lines: List[str], terrain_map: Dict):
+        """Parse LAYER and SCHEDULE lines.
+        
+        LAYER <name> <T>=<factor> ... [AREA x0 y0 x1 y1] multiplies the cost
+        of terrain T (inside the inclusive rectangle, if given) by factor in
+        that layer; several lines for one layer apply in order.
+        SCHEDULE <slot_length> <name> ... cycles through the named layers;
+        the name 'base' means unchanged costs.
+        """
+        terrain = np.array([[cell.terrain.value for cell in row] for row in self.grid])
+        factors: Dict[str, np.ndarray] = {}
+        schedule = None
+        
+        for line in lines:
+            parts = line.split()
+            if parts[0] == 'SCHEDULE':
+                if len(parts) < 3:
+                    raise ValueError("SCHEDULE needs a slot length and at least one layer")
+                schedule = (int(parts[1]), parts[2:])
+                continue
+            
+            if len(parts) < 3:
+                raise ValueError(f"LAYER line needs a name and factors: {line}")
+            name = parts[1]
+            layer = factors.setdefault(name, np.ones((self.height, self.width)))
+            area = np.ones((self.height, self.width), dtype=bool)
+            if 'AREA' in parts:
+                i = parts.index('AREA')
+                x0, y0, x1, y1 = map(int, parts[i+1:i+5])
+                area[:] = False
+                area[y0:y1+1, x0:x1+1] = True
+                parts = parts[:i] + parts[i+5:]
+            for token in parts[2:]:
+                char, _, value = token.partition('=')
+                if char not in terrain_map or char == 'X' or not value:
+                    raise ValueError(f"Bad layer factor '{token}', expected e.g. R=2.5")
+                layer[area & (terrain == terrain_map[char].value)] = float(value)
+        
+        for name, layer in factors.items():
+            self.add_cost_layer(name, layer)
+        if schedule is not None:
+            slot_length, names = schedule
+            if 'base' in names and 'base' not in self.layer_names:
+                self.add_cost_layer('base')
+            self.set_layer_schedule(slot_length, names)
+
+    def sync_dynamic_flags(self):
+        """Bring Cell.dynamic_obstacle up to date if a Scenario owns the obstacles"""
+        if self.dynamic_flag_source is not None:
+            self.dynamic_flag_source()
+    
+    def visualize(self, agent_pos: Tuple[int, int] = None, path: List[Tuple[int, int]] = None):
+        """Simple text visualization of the grid"""
+        self.sync_dynamic_flags()
+        symbols = {
+            Terrain.ROAD: '.',
+            Terrain.GRASS: 'g',
+            Terrain.SAND: 's',
+            Terrain.WATER: '~'
+        }
+        
+        print("\n" + "=" * (self.width * 2 + 1))
+        for y in range(self.height):
+            row = "|"
+            for x in range(self.width):
+                cell = self.grid[y][x]
+                
+                if agent_pos and (x, y) == agent_pos:
+                    row += "A|"
+                elif path and (x, y) in path:
+                    index = path.index((x, y))
+                    row += f"{index % 10}|"
+                elif cell.is_obstacle:
+                    row += "X|"
+                elif cell.dynamic_obstacle:
+                    row += "D|"
+                else:
+                    symbol = symbols.get(cell.terrain, '?')
+                    row += f"{symbol}|"
+            print(row)
         print("=" * (self.width * 2 + 1))
\ No newline at end of file
@@ -0,0 +1,213 @@
+import math
+from typing import Iterator, List, Tuple, TextIO
+
+import numpy as np
+
+# Byte values of the map characters understood by GridEnvironment.load_from_file
+ROAD, GRASS, SAND, WATER, OBSTACLE = (ord(c) for c in 'RGSWX')
+
+# Kinds of city block interiors
+PLAZA, BUILDING, PARK, MAZE = range(4)
+
+_SALT_BLOCK = 0x1F3D5B79
+_SALT_MAZE = 0x2C4E6A8F
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, used as a stateless per-cell random source"""
+    z = values.astype(np.uint64, copy=True)
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+class CityMapGenerator:
+    """Seeded generator for large city maps, produced one row at a time.
+
+    The map is a grid of streets every `block_size` cells, closed by a ring
+    road along the right and bottom edges. Each block interior is a plaza
+    (road), a building (obstacle), a park (grass) or a small maze. Water bodies and grass/sand patches are discs laid over the
+    block interiors; streets cross water as bridges, so every street and
+    every non-building block stays reachable. Only the disc lists are kept
+    in memory, everything else is derived per row from the seed.
+    """
+
+    def __init__(self, width: int, height: int, seed: int = 0, block_size: int = 10,
+                 street_width: int = 1, building_density: float = 0.3,
+                 park_density: float = 0.1, maze_density: float = 0.05,
+                 terrain_density: float = 0.05, water_density: float = 0.03,
+                 moving_density: float = 0.001, route_length: int = 8):
+        if width < 1 or height < 1:
+            raise ValueError("Map dimensions must be positive")
+        if not 0 < street_width < block_size:
+            raise ValueError("street_width must be between 1 and block_size - 1")
+        if building_density + park_density + maze_density > 1:
+            raise ValueError("Block densities must sum to at most 1")
+
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.block_size = block_size
+        self.street_width = street_width
+        self.building_density = building_density
+        self.park_density = park_density
+        self.maze_density = maze_density
+        self.moving_density = moving_density
+        self.route_length = route_length
+
+        self._xs = np.arange(width, dtype=np.int64)
+        self._local_x = self._xs % block_size
+        self._block_x = self._xs // block_size
+        # A ring road along the right and bottom edges closes off partial blocks
+        self._street_columns = (self._local_x < street_width) | (self._xs == width - 1)
+
+        rng = np.random.default_rng(seed)
+        self._water = self._make_discs(rng, water_density, [WATER])
+        self._patches = self._make_discs(rng, terrain_density, [GRASS, SAND])
+
+    def _make_discs(self, rng: np.random.Generator, density: float, kinds: List[int]):
+        """Random discs covering roughly `density` of the map, sorted by centre row"""
+        min_radius = max(1, self.block_size // 2)
+        max_radius = max(min_radius + 1, 3 * self.block_size)
+        mean_area = math.pi * ((min_radius + max_radius) / 2) ** 2
+        count = int(density * self.width * self.height / mean_area)
+
+        cx = rng.integers(0, self.width, count)
+        cy = rng.integers(0, self.height, count)
+        radius = rng.integers(min_radius, max_radius + 1, count)
+        kind = rng.choice(np.array(kinds, dtype=np.uint8), count)
+        order = np.argsort(cy, kind='stable')
+        return cx[order], cy[order], radius[order], kind[order], max_radius
+
+    def _hash(self, xs: np.ndarray, ys, salt: int) -> np.ndarray:
+        key = (np.uint64(self.seed & 0xFFFFFFFF) << np.uint64(32)) ^ np.uint64(salt)
+        return _mix(_mix(xs.astype(np.uint64) ^ key) + np.asarray(ys, dtype=np.uint64))
+
+    def block_kinds(self, block_y: int) -> np.ndarray:
+        """Interior kind of every block in one row of blocks"""
+        block_xs = np.arange(self._block_x[-1] + 1, dtype=np.int64)
+        u = (self._hash(block_xs, block_y, _SALT_BLOCK) >> np.uint64(11)) / float(1 << 53)
+        kinds = np.full(len(block_xs), PLAZA, dtype=np.uint8)
+        edges = np.cumsum([self.building_density, self.park_density, self.maze_density])
+        kinds[u < edges[2]] = MAZE
+        kinds[u < edges[1]] = PARK
+        kinds[u < edges[0]] = BUILDING
+        return kinds
+
+    def _carves_east(self, xs: np.ndarray, y: int) -> np.ndarray:
+        """Binary-tree maze: every maze cell opens either east or north"""
+        return (self._hash(xs, y, _SALT_MAZE) & np.uint64(1)).astype(bool)
+
+    def _maze_row(self, y: int, local_y: int) -> np.ndarray:
+        interior = self.block_size - self.street_width
+        mx = self._local_x - self.street_width
+        my = local_y - self.street_width
+        row = np.full(self.width, OBSTACLE, dtype=np.uint8)
+
+        if my % 2 == 0:
+            row[mx % 2 == 0] = ROAD  # Maze cells
+            passages = mx % 2 == 1
+            east = self._carves_east(self._xs - 1, y)
+            row[passages & east] = ROAD
+        elif my + 1 < interior:
+            cells = mx % 2 == 0
+            north = ~self._carves_east(self._xs, y + 1)
+            row[cells & north] = ROAD
+        return row
+
+    def _overlay(self, row: np.ndarray, y: int, discs, allowed: np.ndarray):
+        cx, cy, radius, kind, max_radius = discs
+        lo = np.searchsorted(cy, y - max_radius, side='left')
+        hi = np.searchsorted(cy, y + max_radius, side='right')
+        for i in range(lo, hi):
+            dy = abs(y - cy[i])
+            if dy > radius[i]:
+                continue
+            half = int(math.isqrt(int(radius[i] ** 2 - dy ** 2)))
+            left, right = max(0, cx[i] - half), min(self.width, cx[i] + half + 1)
+            span = allowed[left:right]
+            row[left:right][span] = kind[i]
+
+    def row(self, y: int) -> np.ndarray:
+        """Map characters of row y as a uint8 array"""
+        local_y = y % self.block_size
+        if local_y < self.street_width or y == self.height - 1:
+            return np.full(self.width, ROAD, dtype=np.uint8)
+
+        kinds = self.block_kinds(y // self.block_size)[self._block_x]
+        row = np.full(self.width, ROAD, dtype=np.uint8)
+        row[kinds == BUILDING] = OBSTACLE
+        row[kinds == PARK] = GRASS
+        is_maze = kinds == MAZE
+        if is_maze.any():
+            row[is_maze] = self._maze_row(y, local_y)[is_maze]
+
+        interior = ~self._street_columns
+        row[self._street_columns] = ROAD
+        # Lakes flood block interiors; walls of mazes stay walls
+        self._overlay(row, y, self._water, interior & ~is_maze)
+        self._overlay(row, y, self._patches, interior & (row == ROAD))
+        return row
+
+    def rows(self) -> Iterator[np.ndarray]:
+        for y in range(self.height):
+            yield self.row(y)
+
+    def intersections(self) -> Tuple[int, int]:
+        """Number of street intersections along x and y"""
+        return ((self.width - 1) // self.block_size + 1,
+                (self.height - 1) // self.block_size + 1)
+
+    def endpoints(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Seeded start and goal, both on street intersections"""
+        rng = np.random.default_rng([self.seed, 1])
+        nx, ny = self.intersections()
+        start = (int(rng.integers(nx)) * self.block_size, int(rng.integers(ny)) * self.block_size)
+        goal = (int(rng.integers(nx)) * self.block_size, int(rng.integers(ny)) * self.block_size)
+        if goal == start and nx * ny > 1:
+            goal = ((nx - 1) * self.block_size, (ny - 1) * self.block_size)
+            if goal == start:
+                goal = (0, 0)
+        return start, goal
+
+    def moving_obstacles(self) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+        """(speed, route) pairs: vehicles driving back and forth along streets"""
+        rng = np.random.default_rng([self.seed, 2])
+        nx, ny = self.intersections()
+        street_cells = nx * self.height + ny * self.width
+        for _ in range(int(self.moving_density * street_cells)):
+            speed = int(rng.integers(1, 4))
+            length = int(rng.integers(2, self.route_length + 1))
+            if rng.random() < 0.5:
+                y = int(rng.integers(ny)) * self.block_size
+                x0 = int(rng.integers(0, max(1, self.width - length + 1)))
+                forward = [(x, y) for x in range(x0, min(self.width, x0 + length))]
+            else:
+                x = int(rng.integers(nx)) * self.block_size
+                y0 = int(rng.integers(0, max(1, self.height - length + 1)))
+                forward = [(x, y) for y in range(y0, min(self.height, y0 + length))]
+            yield speed, forward + forward[-2:0:-1]
+
+    def write(self, output: TextIO, compact: bool = False):
+        """Stream the map to an open text file in the .map format"""
+        start, goal = self.endpoints()
+        output.write(f"{self.width} {self.height}\n")
+        output.write(f"{start[0]} {start[1]} {goal[0]} {goal[1]}\n")
+
+        spaced = np.full(max(2 * self.width - 1, 1), ord(' '), dtype=np.uint8)
+        for row in self.rows():
+            if compact:
+                output.write(row.tobytes().decode('ascii'))
+            else:
+                spaced[::2] = row
+                output.write(spaced.tobytes().decode('ascii'))
+            output.write("\n")
+
+        for speed, route in self.moving_obstacles():
+            coords = ' '.join(f"{x} {y}" for x, y in route)
+            output.write(f"MOVING {speed} {coords}\n")
+
+    def save(self, filename: str, compact: bool = False):
+        with open(filename, 'w') as f:
+            self.write(f, compact)
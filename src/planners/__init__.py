@@ -1,9 +1,15 @@
-from .uninformed import BFSPlanner, UniformCostPlanner
-from .informed import AStarPlanner
-from .local_search import HillClimbingPlanner, SimulatedAnnealingPlanner
-
-__all__ = [
-    'BFSPlanner', 'UniformCostPlanner', 
-    'AStarPlanner', 
-    'HillClimbingPlanner', 'SimulatedAnnealingPlanner'
+from .uninformed import BFSPlanner, UniformCostPlanner
+from .informed import AStarPlanner, TimeDependentAStarPlanner
+from .local_search import HillClimbingPlanner, SimulatedAnnealingPlanner, GeneticPlanner
+from .memory_bounded import FrontierAStarPlanner
+from .contraction import ContractionHierarchy, ContractionHierarchyPlanner
+from .realtime import RealTimePlanner
+
+__all__ = [
+    'BFSPlanner', 'UniformCostPlanner', 
+    'AStarPlanner', 'TimeDependentAStarPlanner',
+    'HillClimbingPlanner', 'SimulatedAnnealingPlanner', 'GeneticPlanner',
+    'FrontierAStarPlanner',
+    'ContractionHierarchy', 'ContractionHierarchyPlanner',
+    'RealTimePlanner'
 ]
\ No newline at end of file
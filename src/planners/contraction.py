@@ -0,0 +1,395 @@
+import heapq
+import os
+import time
+from typing import List, Tuple, Dict, Optional, Iterable
+
+import numpy as np
+
+from src.agent import Planner
+from src.planners.informed import AStarPlanner
+from src.utils import map_hash
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+def _to_csr(adjacency: Dict[int, List[Tuple[int, float]]], size: int):
+    counts = np.zeros(size + 1, dtype=np.int64)
+    for node, edges in adjacency.items():
+        counts[node + 1] = len(edges)
+    offsets = np.cumsum(counts)
+    targets = np.empty(offsets[-1], dtype=np.int64)
+    costs = np.empty(offsets[-1], dtype=np.float64)
+    for node, edges in adjacency.items():
+        start = offsets[node]
+        for i, (target, cost) in enumerate(edges):
+            targets[start + i] = target
+            costs[start + i] = cost
+    return offsets, targets, costs
+
+def _from_csr(offsets: np.ndarray, targets: np.ndarray, costs: np.ndarray):
+    targets, costs = targets.tolist(), costs.tolist()
+    return [list(zip(targets[a:b], costs[a:b]))
+            for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+class ContractionHierarchy:
+    """Contraction hierarchy over the static cost graph of a GridEnvironment.
+
+    Nodes are passable cells (id = y * width + x) and moving onto a cell
+    costs that cell's terrain cost, so the graph is directed. Nodes are
+    contracted one by one in order of edge difference; whenever the
+    shortest path between two neighbours of a contracted node ran through
+    it, a shortcut edge remembering that middle node is added. A query then
+    only relaxes edges that lead to higher-ranked nodes from both ends.
+    """
+
+    def __init__(self, width: int, height: int, rank: np.ndarray,
+                 up: List[List[Tuple[int, float]]], down: List[List[Tuple[int, float]]],
+                 middle: Dict[Tuple[int, int], int], key: str = ''):
+        self.width = width
+        self.height = height
+        self.rank = rank
+        self.up = up          # up[u]: edges u -> w with rank[w] > rank[u]
+        self.down = down      # down[u]: edges w -> u with rank[w] > rank[u], stored as (w, cost)
+        self.middle = middle  # (u, w) -> contracted node the shortcut u -> w skips
+        self.key = key
+        self.settled = 0
+
+    @classmethod
+    def build(cls, environment, witness_limit: int = 64) -> 'ContractionHierarchy':
+        """Contract every passable cell of the environment.
+
+        `witness_limit` caps how many nodes each witness search may settle.
+        Smaller limits preprocess faster but add redundant shortcuts.
+        """
+        width, height = environment.width, environment.height
+        costs = environment.cost_array.ravel()
+        nodes = np.flatnonzero(np.isfinite(costs)).tolist()
+
+        out_edges: Dict[int, Dict[int, float]] = {v: {} for v in nodes}
+        in_edges: Dict[int, Dict[int, float]] = {v: {} for v in nodes}
+        for v in nodes:
+            x, y = v % width, v // width
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    w = ny * width + nx
+                    if w in in_edges:
+                        out_edges[v][w] = costs[w]
+                        in_edges[w][v] = costs[w]
+
+        contracted_neighbors = dict.fromkeys(nodes, 0)
+        depth = dict.fromkeys(nodes, 0)  # Height of the hierarchy below each node
+        builder = _Contraction(out_edges, in_edges, witness_limit)
+
+        def priority(v):
+            shortcuts = builder.shortcuts(v)
+            removed = len(in_edges[v]) + len(out_edges[v])
+            return len(shortcuts) - removed + contracted_neighbors[v] + depth[v], shortcuts
+
+        heap = [(priority(v)[0], v) for v in nodes]
+        heapq.heapify(heap)
+
+        rank = np.full(width * height, -1, dtype=np.int64)
+        up = {v: [] for v in nodes}
+        down = {v: [] for v in nodes}
+        middle: Dict[Tuple[int, int], int] = {}
+        level = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            # Lazy update: re-evaluate and defer if no longer the cheapest
+            current, shortcuts = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            rank[v] = level
+            level += 1
+            up[v] = list(out_edges[v].items())
+            down[v] = list(in_edges[v].items())
+
+            for u, w, cost in shortcuts:
+                if cost < out_edges[u].get(w, float('inf')):
+                    out_edges[u][w] = cost
+                    in_edges[w][u] = cost
+                    middle[(u, w)] = v
+
+            for w in out_edges.pop(v):
+                del in_edges[w][v]
+                contracted_neighbors[w] += 1
+                depth[w] = max(depth[w], depth[v] + 1)
+            for u in in_edges.pop(v):
+                del out_edges[u][v]
+                contracted_neighbors[u] += 1
+                depth[u] = max(depth[u], depth[v] + 1)
+
+        size = width * height
+        up_offsets, up_targets, up_costs = _to_csr(up, size)
+        down_offsets, down_targets, down_costs = _to_csr(down, size)
+        return cls(width, height, rank,
+                   _from_csr(up_offsets, up_targets, up_costs),
+                   _from_csr(down_offsets, down_targets, down_costs),
+                   middle, map_hash(environment))
+
+    @property
+    def num_shortcuts(self) -> int:
+        return len(self.middle)
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        size = self.width * self.height
+        up_offsets, up_targets, up_costs = _to_csr(dict(enumerate(self.up)), size)
+        down_offsets, down_targets, down_costs = _to_csr(dict(enumerate(self.down)), size)
+        shortcuts = np.array([(u, w, m) for (u, w), m in self.middle.items()],
+                             dtype=np.int64).reshape(-1, 3)
+        return {
+            'shape': np.array([self.width, self.height], dtype=np.int64),
+            'rank': self.rank,
+            'up_offsets': up_offsets, 'up_targets': up_targets, 'up_costs': up_costs,
+            'down_offsets': down_offsets, 'down_targets': down_targets, 'down_costs': down_costs,
+            'shortcuts': shortcuts,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index in its serialized form"""
+        return sum(array.nbytes for array in self._arrays().values())
+
+    def save(self, filename: str):
+        with open(filename, 'wb') as f:
+            np.savez(f, key=np.array(self.key), **self._arrays())
+
+    @classmethod
+    def load(cls, filename: str) -> 'ContractionHierarchy':
+        with np.load(filename) as data:
+            width, height = (int(v) for v in data['shape'])
+            middle = {(u, w): m for u, w, m in data['shortcuts'].tolist()}
+            return cls(width, height, data['rank'],
+                       _from_csr(data['up_offsets'], data['up_targets'], data['up_costs']),
+                       _from_csr(data['down_offsets'], data['down_targets'], data['down_costs']),
+                       middle, str(data['key']))
+
+    def query(self, sources: Dict[int, float], target: int) -> Tuple[float, List[int]]:
+        """Bidirectional upward search from sources (node -> initial cost) to target.
+
+        Returns the cost and the unpacked node path, which starts at one of
+        the sources, or (inf, []) if the target cannot be reached.
+        """
+        dist = ({}, {target: 0.0})
+        parent = ({}, {target: None})
+        heaps = ([], [(0.0, target)])
+        for node, cost in sources.items():
+            if cost < dist[0].get(node, float('inf')):
+                dist[0][node] = cost
+                parent[0][node] = None
+                heaps[0].append((cost, node))
+        heapq.heapify(heaps[0])
+
+        graphs = (self.up, self.down)
+        best, meeting = float('inf'), None
+        self.settled = 0
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side] or (heaps[1 - side] and heaps[1 - side][0][0] < heaps[side][0][0]):
+                side = 1 - side
+            d, v = heapq.heappop(heaps[side])
+            if d > dist[side][v]:
+                continue
+            if d >= best:
+                heaps[side].clear()  # Nothing left on this side can improve the meeting
+                continue
+            self.settled += 1
+
+            other = dist[1 - side].get(v)
+            if other is not None and d + other < best:
+                best, meeting = d + other, v
+
+            own_dist, own_parent, own_heap = dist[side], parent[side], heaps[side]
+            for w, cost in graphs[side][v]:
+                new_cost = d + cost
+                if new_cost < own_dist.get(w, float('inf')):
+                    own_dist[w] = new_cost
+                    own_parent[w] = v
+                    heapq.heappush(own_heap, (new_cost, w))
+
+        if meeting is None:
+            return float('inf'), []
+
+        # Chain of hierarchy edges: sources ... meeting ... target
+        chain = []
+        node = meeting
+        while node is not None:
+            chain.append(node)
+            node = parent[0][node]
+        chain.reverse()
+        node = parent[1][meeting]
+        while node is not None:
+            chain.append(node)
+            node = parent[1][node]
+
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, path)
+        return best, path
+
+    def _unpack(self, a: int, b: int, path: List[int]):
+        """Append the original nodes of edge a -> b (excluding a) to path"""
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            m = self.middle.get((a, b))
+            if m is None:
+                path.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+
+class _Contraction:
+    """Witness searches on the remaining (not yet contracted) graph"""
+
+    def __init__(self, out_edges, in_edges, witness_limit: int):
+        self.out_edges = out_edges
+        self.in_edges = in_edges
+        self.witness_limit = witness_limit
+
+    def shortcuts(self, v: int) -> List[Tuple[int, int, float]]:
+        """Shortcuts (u, w, cost) needed to contract v"""
+        needed = []
+        outgoing = self.out_edges[v]
+        for u, a in self.in_edges[v].items():
+            targets = {w: a + b for w, b in outgoing.items() if w != u}
+            if not targets:
+                continue
+            witness = self._witness(u, v, max(targets.values()), targets)
+            for w, cost in targets.items():
+                if witness.get(w, float('inf')) > cost:
+                    needed.append((u, w, cost))
+        return needed
+
+    def _witness(self, source: int, avoid: int, max_cost: float, targets: Dict[int, float]):
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        remaining = len(targets)
+        settled = 0
+        while heap and remaining and settled < self.witness_limit:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > max_cost:
+                break
+            settled += 1
+            if u in targets:
+                remaining -= 1
+            for w, cost in self.out_edges[u].items():
+                if w == avoid:
+                    continue
+                new_cost = d + cost
+                if new_cost < dist.get(w, float('inf')):
+                    dist[w] = new_cost
+                    heapq.heappush(heap, (new_cost, w))
+        return dist
+
+class ContractionHierarchyPlanner(Planner):
+    """Optimal planner for static maps queried many times.
+
+    The hierarchy is built on first use (or loaded from `cache_dir`, keyed
+    by the map hash) and then answers each query with a small bidirectional
+    upward search. Moving obstacles are ignored, like in the other planners'
+    initial plans. Editing the map bumps the environment's revision, and the
+    next query then rebuilds (or reloads) the hierarchy for the new map.
+    """
+
+    def __init__(self, environment, cache_dir: Optional[str] = None, witness_limit: int = 64):
+        super().__init__(environment)
+        self.cache_dir = cache_dir
+        self.witness_limit = witness_limit
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        self.revision = None  # Environment revision the hierarchy was built for
+        self.preprocessing_time = 0.0  # Seconds spent building or loading the index
+        self.loaded_from_cache = False
+
+    def cache_file(self) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"ch_{map_hash(self.environment)}.npz")
+
+    def prepare(self) -> ContractionHierarchy:
+        """Build the hierarchy, or load it from the cache if the map is unchanged"""
+        if self.hierarchy is not None and self.revision == self.environment.revision:
+            return self.hierarchy
+
+        start_time = time.perf_counter()
+        self.revision = self.environment.revision
+        filename = self.cache_file()
+        if filename is not None and os.path.exists(filename):
+            self.hierarchy = ContractionHierarchy.load(filename)
+            self.loaded_from_cache = True
+        else:
+            self.hierarchy = ContractionHierarchy.build(self.environment, self.witness_limit)
+            self.loaded_from_cache = False
+            if filename is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self.hierarchy.save(filename)
+        self.preprocessing_time = time.perf_counter() - start_time
+        return self.hierarchy
+
+    def rebuild(self) -> ContractionHierarchy:
+        self.hierarchy = None
+        return self.prepare()
+
+    @property
+    def index_size(self) -> int:
+        """Bytes taken by the hierarchy on disk"""
+        return self.prepare().nbytes
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+
+        if start == goal:
+            return [start]
+
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+
+        hierarchy = self.prepare()
+        width = self.environment.width
+        costs = self.environment.cost_array
+        source = start[1] * width + start[0]
+
+        prefix = []
+        if np.isfinite(costs[start[1], start[0]]):
+            sources = {source: 0.0}
+        else:
+            # A blocked start is not a graph node; leave through its neighbours
+            prefix = [start]
+            sources = {ny * width + nx: cost
+                       for nx, ny, cost in self.environment.get_neighbors(*start)}
+
+        _, nodes = hierarchy.query(sources, goal[1] * width + goal[0])
+        self.nodes_expanded = hierarchy.settled
+        if not nodes:
+            return []
+        return prefix + [(node % width, node // width) for node in nodes]
+
+    def compare_with_astar(self, queries: Iterable[Tuple[Tuple[int, int], Tuple[int, int]]],
+                           heuristic_type: str = 'manhattan') -> Dict[str, float]:
+        """Time the same queries with this planner and AStarPlanner"""
+        self.prepare()
+        astar = AStarPlanner(self.environment, heuristic_type)
+        ch_time = astar_time = 0.0
+        count = 0
+        for start, goal in queries:
+            start_time = time.perf_counter()
+            self.plan(start, goal)
+            ch_time += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            astar.plan(start, goal)
+            astar_time += time.perf_counter() - start_time
+            count += 1
+
+        count = max(count, 1)
+        return {
+            'queries': count,
+            'ch_time': ch_time / count,
+            'astar_time': astar_time / count,
+            'speedup': astar_time / ch_time if ch_time > 0 else float('inf'),
+        }
@@ -1,53 +1,161 @@
-import heapq
-from typing import List, Tuple, Dict
-from src.agent import Planner
-
-class AStarPlanner(Planner):
-    def __init__(self, environment, heuristic_type='manhattan'):
-        super().__init__(environment)
-        self.heuristic_type = heuristic_type
-    
-    def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
-        x1, y1 = a
-        x2, y2 = b
-        
-        if self.heuristic_type == 'manhattan':
-            return abs(x1 - x2) + abs(y1 - y2)
-        elif self.heuristic_type == 'euclidean':
-            return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
-        elif self.heuristic_type == 'chebyshev':
-            return max(abs(x1 - x2), abs(y1 - y2))
-        else:
-            return 0  # Fallback to UCS
-    
-    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-        self.nodes_expanded = 0
-        
-        if start == goal:
-            return [start]
-        
-        frontier = [(0, start)]
-        came_from = {start: None}
-        cost_so_far = {start: 0}
-        
-        while frontier:
-            current_priority, current = heapq.heappop(frontier)
-            self.nodes_expanded += 1
-            
-            if current == goal:
-                return self.reconstruct_path(came_from, current)
-            
-            x, y = current
-            neighbors = self.environment.get_neighbors(x, y)
-            
-            for nx, ny, move_cost in neighbors:
-                neighbor = (nx, ny)
-                new_cost = cost_so_far[current] + move_cost
-                
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                    cost_so_far[neighbor] = new_cost
-                    priority = new_cost + self.heuristic(neighbor, goal)
-                    heapq.heappush(frontier, (priority, neighbor))
-                    came_from[neighbor] = current
-        
-        return []  # No path found
\ No newline at end of file
+from typing import List, Tuple, Dict
+import numpy as np
+from src.agent import Planner
+from src.planners.open_lists import make_open_list
+
+class AStarPlanner(Planner):
+    def __init__(self, environment, heuristic_type='manhattan', open_list='binary',
+                 prune_dead_ends=False):
+        super().__init__(environment, prune_dead_ends)
+        self.heuristic_type = heuristic_type
+        self.open_list = open_list
+    
+    def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
+        x1, y1 = a
+        x2, y2 = b
+        
+        if self.heuristic_type == 'manhattan':
+            return abs(x1 - x2) + abs(y1 - y2)
+        elif self.heuristic_type == 'euclidean':
+            return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+        elif self.heuristic_type == 'chebyshev':
+            return max(abs(x1 - x2), abs(y1 - y2))
+        else:
+            return 0  # Fallback to UCS
+    
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        
+        if start == goal:
+            return [start]
+        
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+        
+        pruned = self.dead_end_cells(start, goal)
+        
+        frontier = make_open_list(self.open_list)
+        frontier.push(start, self.heuristic(start, goal), 0)
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+        
+        while frontier:
+            current_priority, _, current = frontier.pop()
+            self.nodes_expanded += 1
+            
+            if current == goal:
+                return self.reconstruct_path(came_from, current)
+            
+            x, y = current
+            neighbors = self.environment.get_neighbors(x, y)
+            
+            for nx, ny, move_cost in neighbors:
+                if pruned is not None and pruned[ny, nx]:
+                    continue
+                neighbor = (nx, ny)
+                new_cost = cost_so_far[current] + move_cost
+                
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    priority = new_cost + self.heuristic(neighbor, goal)
+                    frontier.push(neighbor, priority, new_cost)
+                    came_from[neighbor] = current
+        
+        return []  # No path found
+
+class TimeDependentAStarPlanner(AStarPlanner):
+    """A* over time-dependent costs from the environment's cost layers.
+
+    Costs are read as travel times: entering a cell at time t takes
+    get_layered_cost(x, y, t) and arrives at t plus that. Each cell keeps
+    only its earliest arrival, which is exact when arriving later never
+    lets one leave earlier (FIFO). A cheaper layer coming up can break
+    that, so with `allow_waiting` the agent may wait for a later slot
+    whenever that arrives sooner, which restores FIFO. Moving obstacles
+    are ignored. After plan(), `arrival_times[i]` and `departure_times[i]`
+    give the timing of path[i]. Priorities are fractional arrival times,
+    so the open list is always the binary heap.
+    """
+
+    def __init__(self, environment, heuristic_type='manhattan', start_time: float = 0,
+                 allow_waiting: bool = True):
+        super().__init__(environment, heuristic_type)
+        self.start_time = start_time
+        self.allow_waiting = allow_waiting
+        self.arrival_times: List[float] = []
+        self.departure_times: List[float] = []
+        self._scale = 1.0
+
+    def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
+        return self._scale * super().heuristic(a, b)
+
+    def _cheapest_step(self) -> float:
+        """Lowest cost of entering any cell at any time, keeps the heuristic admissible"""
+        env = self.environment
+        layers = [env.cost_layers[i] for i in set(env.layer_schedule)] or [None]
+        cheapest = float('inf')
+        for layer in layers:
+            costs = env.cost_array if layer is None else env.cost_array * layer
+            finite = costs[np.isfinite(costs)]
+            if finite.size:
+                cheapest = min(cheapest, float(finite.min()))
+        return cheapest if cheapest < float('inf') else 1.0
+
+    def arrival(self, x: int, y: int, ready: float) -> Tuple[float, float]:
+        """Earliest (arrival, departure) into cell (x, y) for an agent ready at `ready`"""
+        env = self.environment
+        depart = ready
+        arrive = ready + env.get_layered_cost(x, y, ready)
+        if not self.allow_waiting or not env.layer_schedule:
+            return arrive, depart
+        # Within a slot, leaving later only arrives later; check later slot starts
+        slot_start = env.next_slot_start(ready)
+        while slot_start < arrive:
+            candidate = slot_start + env.get_layered_cost(x, y, slot_start)
+            if candidate < arrive:
+                arrive, depart = candidate, slot_start
+            slot_start += env.slot_length
+        return arrive, depart
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        self.arrival_times = []
+        self.departure_times = []
+
+        if start == goal:
+            self.arrival_times = self.departure_times = [self.start_time]
+            return [start]
+
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+
+        self._scale = self._cheapest_step()
+        frontier = make_open_list(self.open_list)
+        frontier.push(start, self.start_time + self.heuristic(start, goal), self.start_time)
+        came_from = {start: None}
+        arrival = {start: self.start_time}
+        departure = {}
+
+        while frontier:
+            _, _, current = frontier.pop()
+            self.nodes_expanded += 1
+
+            if current == goal:
+                path = self.reconstruct_path(came_from, current)
+                self.arrival_times = [arrival[cell] for cell in path]
+                self.departure_times = [departure.get(cell, arrival[cell]) for cell in path[1:]]
+                self.departure_times.append(arrival[goal])
+                return path
+
+            x, y = current
+            for nx, ny, _ in self.environment.get_neighbors(x, y):
+                neighbor = (nx, ny)
+                arrive, depart = self.arrival(nx, ny, arrival[current])
+
+                if neighbor not in arrival or arrive < arrival[neighbor]:
+                    arrival[neighbor] = arrive
+                    departure[neighbor] = depart
+                    came_from[neighbor] = current
+                    frontier.push(neighbor, arrive + self.heuristic(neighbor, goal), arrive)
+
+        return []  # No path found
@@ -1,207 +1,591 @@
-import random
-import math
-from typing import List, Tuple, Dict
-from src.agent import Planner
-
-class HillClimbingPlanner(Planner):
-    def __init__(self, environment, max_iterations=1000, max_sideways=100):
-        super().__init__(environment)
-        self.max_iterations = max_iterations
-        self.max_sideways = max_sideways
-    
-    def get_random_path(self, start: Tuple[int, int], goal: Tuple[int, int], 
-                       max_length: int = 50) -> List[Tuple[int, int]]:
-        """Generate a random valid path using random walks"""
-        path = [start]
-        current = start
-        steps = 0
-        
-        while current != goal and steps < max_length:
-            x, y = current
-            neighbors = self.environment.get_neighbors(x, y)
-            valid_neighbors = [n for n in neighbors if n[:2] not in path]
-            
-            if not valid_neighbors:
-                # Dead end, try to backtrack
-                if len(path) > 1:
-                    path.pop()
-                    current = path[-1]
-                else:
-                    break
-                continue
-            
-            next_pos = random.choice(valid_neighbors)[:2]
-            path.append(next_pos)
-            current = next_pos
-            steps += 1
-        
-        return path if current == goal else []
-    
-    def path_cost(self, path: List[Tuple[int, int]]) -> float:
-        """Calculate total cost of a path"""
-        if len(path) < 2:
-            return float('inf')
-        
-        total_cost = 0
-        for i in range(len(path) - 1):
-            x1, y1 = path[i]
-            x2, y2 = path[i + 1]
-            cost = self.environment.get_cost(x2, y2)
-            if cost == float('inf'):
-                return float('inf')
-            total_cost += cost
-        return total_cost
-    
-    def get_neighbor_path(self, path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        """Generate a neighboring path by mutation"""
-        if len(path) <= 2:
-            return path
-        
-        new_path = path.copy()
-        mutation_type = random.choice(['swap', 'insert', 'remove', 'replace'])
-        
-        try:
-            if mutation_type == 'swap' and len(path) > 3:
-                i = random.randint(1, len(path) - 3)
-                new_path[i], new_path[i + 1] = new_path[i + 1], new_path[i]
-            
-            elif mutation_type == 'insert' and len(path) > 2:
-                i = random.randint(1, len(path) - 2)
-                x, y = new_path[i]
-                neighbors = self.environment.get_neighbors(x, y)
-                if neighbors:
-                    new_pos = random.choice(neighbors)[:2]
-                    if new_pos not in new_path:
-                        new_path.insert(i + 1, new_pos)
-            
-            elif mutation_type == 'remove' and len(path) > 3:
-                i = random.randint(1, len(path) - 2)
-                # Check if removal maintains connectivity
-                if i > 0 and i < len(new_path) - 1:
-                    prev = new_path[i - 1]
-                    next_pos = new_path[i + 1]
-                    if self._are_adjacent(prev, next_pos):
-                        new_path.pop(i)
-            
-            elif mutation_type == 'replace' and len(path) > 2:
-                i = random.randint(1, len(path) - 2)
-                x, y = new_path[i]
-                neighbors = self.environment.get_neighbors(x, y)
-                if neighbors:
-                    new_pos = random.choice(neighbors)[:2]
-                    if new_pos not in new_path:
-                        new_path[i] = new_pos
-            
-        except (IndexError, ValueError):
-            return path  # Return original if mutation fails
-        
-        return new_path if self._is_valid_path(new_path) else path
-    
-    def _are_adjacent(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
-        x1, y1 = pos1
-        x2, y2 = pos2
-        return abs(x1 - x2) + abs(y1 - y2) == 1
-    
-    def _is_valid_path(self, path: List[Tuple[int, int]]) -> bool:
-        """Check if path is valid (connected and traversable)"""
-        if not path or path[0] != path[0] or path[-1] != path[-1]:
-            return False
-        
-        for i in range(len(path) - 1):
-            if not self._are_adjacent(path[i], path[i + 1]):
-                return False
-            if not self.environment.is_valid_position(path[i + 1][0], path[i + 1][1]):
-                return False
-        
-        return True
-    
-    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-        self.nodes_expanded = 0
-        
-        # Generate initial solution
-        current_path = self.get_random_path(start, goal)
-        if not current_path:
-            return []
-        
-        current_cost = self.path_cost(current_path)
-        best_path = current_path.copy()
-        best_cost = current_cost
-        sideways_moves = 0
-        
-        for iteration in range(self.max_iterations):
-            self.nodes_expanded += 1
-            
-            # Generate neighbor
-            neighbor_path = self.get_neighbor_path(current_path)
-            neighbor_cost = self.path_cost(neighbor_path)
-            
-            if neighbor_cost < current_cost:
-                # Better solution found
-                current_path = neighbor_path
-                current_cost = neighbor_cost
-                sideways_moves = 0
-                
-                if neighbor_cost < best_cost:
-                    best_path = neighbor_path.copy()
-                    best_cost = neighbor_cost
-            
-            elif neighbor_cost == current_cost and sideways_moves < self.max_sideways:
-                # Equal cost, accept with sideways motion
-                current_path = neighbor_path
-                sideways_moves += 1
-            
-            else:
-                # Random restart
-                current_path = self.get_random_path(start, goal)
-                if not current_path:
-                    continue
-                current_cost = self.path_cost(current_path)
-                sideways_moves = 0
-            
-            # Check for goal
-            if current_path and current_path[-1] == goal:
-                if self.path_cost(current_path) < best_cost:
-                    best_path = current_path.copy()
-                break
-        
-        return best_path if best_path and best_path[-1] == goal else []
-
-class SimulatedAnnealingPlanner(HillClimbingPlanner):
-    def __init__(self, environment, initial_temp=1000, cooling_rate=0.95, min_temp=1):
-        super().__init__(environment)
-        self.initial_temp = initial_temp
-        self.cooling_rate = cooling_rate
-        self.min_temp = min_temp
-    
-    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-        self.nodes_expanded = 0
-        
-        current_path = self.get_random_path(start, goal)
-        if not current_path:
-            return []
-        
-        current_cost = self.path_cost(current_path)
-        best_path = current_path.copy()
-        best_cost = current_cost
-        
-        temperature = self.initial_temp
-        
-        while temperature > self.min_temp and current_path[-1] != goal:
-            self.nodes_expanded += 1
-            
-            neighbor_path = self.get_neighbor_path(current_path)
-            neighbor_cost = self.path_cost(neighbor_path)
-            
-            cost_diff = neighbor_cost - current_cost
-            
-            if cost_diff < 0 or random.random() < math.exp(-cost_diff / temperature):
-                current_path = neighbor_path
-                current_cost = neighbor_cost
-                
-                if current_cost < best_cost and current_path[-1] == goal:
-                    best_path = current_path.copy()
-                    best_cost = current_cost
-            
-            temperature *= self.cooling_rate
-        
-        return best_path if best_path and best_path[-1] == goal else []
\ No newline at end of file
+import heapq
+import random
+import math
+import time
+from typing import List, Tuple, Dict, Optional
+
+import numpy as np
+
+from src.agent import Planner
+from src.trajectory import DIRECTIONS
+
+class HillClimbingPlanner(Planner):
+    def __init__(self, environment, max_iterations=1000, max_sideways=100):
+        super().__init__(environment)
+        self.max_iterations = max_iterations
+        self.max_sideways = max_sideways
+    
+    def get_random_path(self, start: Tuple[int, int], goal: Tuple[int, int], 
+                       max_length: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Generate a random valid path using random walks.
+        
+        Cells are never re-entered, also after backtracking out of a dead
+        end, so the walk reaches any reachable goal within width * height
+        steps (the default `max_length`).
+        """
+        if max_length is None:
+            max_length = self.environment.width * self.environment.height
+        path = [start]
+        visited = {start}
+        current = start
+        steps = 0
+        
+        while current != goal and steps < max_length:
+            x, y = current
+            neighbors = self.environment.get_neighbors(x, y)
+            valid_neighbors = [n for n in neighbors if n[:2] not in visited]
+            
+            if not valid_neighbors:
+                # Dead end, try to backtrack
+                if len(path) > 1:
+                    path.pop()
+                    current = path[-1]
+                else:
+                    break
+                continue
+            
+            next_pos = random.choice(valid_neighbors)[:2]
+            path.append(next_pos)
+            visited.add(next_pos)
+            current = next_pos
+            steps += 1
+        
+        return path if current == goal else []
+    
+    def path_cost(self, path: List[Tuple[int, int]]) -> float:
+        """Calculate total cost of a path"""
+        if len(path) < 2:
+            return float('inf')
+        
+        total_cost = 0
+        for i in range(len(path) - 1):
+            x1, y1 = path[i]
+            x2, y2 = path[i + 1]
+            cost = self.environment.get_cost(x2, y2)
+            if cost == float('inf'):
+                return float('inf')
+            total_cost += cost
+        return total_cost
+    
+    def get_neighbor_path(self, path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Generate a neighboring path by mutation"""
+        if len(path) <= 2:
+            return path
+        
+        new_path = path.copy()
+        mutation_type = random.choice(['swap', 'insert', 'remove', 'replace'])
+        
+        try:
+            if mutation_type == 'swap' and len(path) > 3:
+                i = random.randint(1, len(path) - 3)
+                new_path[i], new_path[i + 1] = new_path[i + 1], new_path[i]
+            
+            elif mutation_type == 'insert' and len(path) > 2:
+                i = random.randint(1, len(path) - 2)
+                x, y = new_path[i]
+                neighbors = self.environment.get_neighbors(x, y)
+                if neighbors:
+                    new_pos = random.choice(neighbors)[:2]
+                    if new_pos not in new_path:
+                        new_path.insert(i + 1, new_pos)
+            
+            elif mutation_type == 'remove' and len(path) > 3:
+                i = random.randint(1, len(path) - 2)
+                # Check if removal maintains connectivity
+                if i > 0 and i < len(new_path) - 1:
+                    prev = new_path[i - 1]
+                    next_pos = new_path[i + 1]
+                    if self._are_adjacent(prev, next_pos):
+                        new_path.pop(i)
+            
+            elif mutation_type == 'replace' and len(path) > 2:
+                i = random.randint(1, len(path) - 2)
+                x, y = new_path[i]
+                neighbors = self.environment.get_neighbors(x, y)
+                if neighbors:
+                    new_pos = random.choice(neighbors)[:2]
+                    if new_pos not in new_path:
+                        new_path[i] = new_pos
+            
+        except (IndexError, ValueError):
+            return path  # Return original if mutation fails
+        
+        return new_path if self._is_valid_path(new_path) else path
+    
+    def _are_adjacent(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
+        x1, y1 = pos1
+        x2, y2 = pos2
+        return abs(x1 - x2) + abs(y1 - y2) == 1
+    
+    def _is_valid_path(self, path: List[Tuple[int, int]]) -> bool:
+        """Check if path is valid (connected and traversable)"""
+        if not path or path[0] != path[0] or path[-1] != path[-1]:
+            return False
+        
+        for i in range(len(path) - 1):
+            if not self._are_adjacent(path[i], path[i + 1]):
+                return False
+            if not self.environment.is_valid_position(path[i + 1][0], path[i + 1][1]):
+                return False
+        
+        return True
+    
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+        
+        # Generate initial solution
+        current_path = self.get_random_path(start, goal)
+        if not current_path:
+            return []
+        
+        current_cost = self.path_cost(current_path)
+        best_path = current_path.copy()
+        best_cost = current_cost
+        sideways_moves = 0
+        
+        for iteration in range(self.max_iterations):
+            self.nodes_expanded += 1
+            
+            # Generate neighbor
+            neighbor_path = self.get_neighbor_path(current_path)
+            neighbor_cost = self.path_cost(neighbor_path)
+            
+            if neighbor_cost < current_cost:
+                # Better solution found
+                current_path = neighbor_path
+                current_cost = neighbor_cost
+                sideways_moves = 0
+                
+                if neighbor_cost < best_cost:
+                    best_path = neighbor_path.copy()
+                    best_cost = neighbor_cost
+            
+            elif neighbor_cost == current_cost and sideways_moves < self.max_sideways:
+                # Equal cost, accept with sideways motion
+                current_path = neighbor_path
+                sideways_moves += 1
+            
+            else:
+                # Random restart
+                current_path = self.get_random_path(start, goal)
+                if not current_path:
+                    continue
+                current_cost = self.path_cost(current_path)
+                sideways_moves = 0
+            
+            # Check for goal
+            if current_path and current_path[-1] == goal:
+                if self.path_cost(current_path) < best_cost:
+                    best_path = current_path.copy()
+                break
+        
+        return best_path if best_path and best_path[-1] == goal else []
+
+class SimulatedAnnealingPlanner(HillClimbingPlanner):
+    def __init__(self, environment, initial_temp=1000, cooling_rate=0.95, min_temp=1):
+        super().__init__(environment)
+        self.initial_temp = initial_temp
+        self.cooling_rate = cooling_rate
+        self.min_temp = min_temp
+    
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+        
+        current_path = self.get_random_path(start, goal)
+        if not current_path:
+            return []
+        
+        current_cost = self.path_cost(current_path)
+        best_path = current_path.copy()
+        best_cost = current_cost
+        
+        temperature = self.initial_temp
+        
+        while temperature > self.min_temp and current_path[-1] != goal:
+            self.nodes_expanded += 1
+            
+            neighbor_path = self.get_neighbor_path(current_path)
+            neighbor_cost = self.path_cost(neighbor_path)
+            
+            cost_diff = neighbor_cost - current_cost
+            
+            if cost_diff < 0 or random.random() < math.exp(-cost_diff / temperature):
+                current_path = neighbor_path
+                current_cost = neighbor_cost
+                
+                if current_cost < best_cost and current_path[-1] == goal:
+                    best_path = current_path.copy()
+                    best_cost = current_cost
+            
+            temperature *= self.cooling_rate
+        
+        return best_path if best_path and best_path[-1] == goal else []
+
+PAD = len(DIRECTIONS)  # Gene for "no move", used to fill up short paths
+_DX = np.array([d[0] for d in DIRECTIONS] + [0], dtype=np.int64)
+_DY = np.array([d[1] for d in DIRECTIONS] + [0], dtype=np.int64)
+_OPPOSITE = np.array([DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS] + [PAD], dtype=np.int8)
+# Direction code of a unit step, indexed [dx + 1, dy + 1]
+_STEP_CODE = np.full((3, 3), PAD, dtype=np.int8)
+for _code, (_dx, _dy) in enumerate(DIRECTIONS):
+    _STEP_CODE[_dx + 1, _dy + 1] = _code
+
+class GeneticPlanner(Planner):
+    """Genetic algorithm over a NumPy population of direction strings.
+
+    Each individual is a row of direction codes (padded with PAD) walked
+    from the start. Fitness is the path cost plus a penalty per blocked or
+    off-grid step and per cell the walk ends away from the goal, evaluated
+    for the whole population at once against the environment's cost array.
+    The population is seeded with cheap constructive paths (randomized
+    greedy best-first searches and straight staircase paths), then evolved
+    with crossover at shared cells, segment-reversal mutation and shortcut
+    repair. The first `reroutes` individuals of every generation (by
+    default the elites) also get a random stretch replaced by its cheapest local route.
+    Evolution stops when `generations` or `time_budget` run out, or when the
+    best path has not improved for `patience` generations, which defaults
+    to width + height so larger maps get proportionally more generations.
+    """
+
+    def __init__(self, environment, population_size=60, generations=200, mutation_rate=0.3,
+                 elite_size=4, tournament_size=3, time_budget: Optional[float] = 2.0,
+                 patience: Optional[int] = None, reroutes: int = 4, seed: Optional[int] = None):
+        super().__init__(environment)
+        if population_size < 2:
+            raise ValueError(f"population_size must be at least 2, got {population_size}")
+        if not 0 <= elite_size < population_size:
+            raise ValueError(f"elite_size must be between 0 and population_size - 1, got {elite_size}")
+        if tournament_size < 1:
+            raise ValueError(f"tournament_size must be at least 1, got {tournament_size}")
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.tournament_size = tournament_size
+        self.time_budget = time_budget
+        if patience is None:
+            patience = environment.width + environment.height
+        self.patience = patience
+        self.reroutes = reroutes
+        self.seed = seed
+        self.generations_run = 0
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        self.generations_run = 0
+
+        if start == goal:
+            return [start]
+
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        self._rng = np.random.default_rng(self.seed)
+        self._start, self._goal = start, goal
+        costs = self.environment.cost_array
+        finite = costs[np.isfinite(costs)]
+        self._penalty = 4 * float(finite.max()) if finite.size else 1.0
+
+        seeds = self.seed_paths(start, goal)
+        length = max(2 * max(len(path) for path in seeds),
+                     2 * (abs(start[0] - goal[0]) + abs(start[1] - goal[1])))
+        population = self._initial_population(seeds, length)
+
+        best_fitness, best_genes = float('inf'), None
+        stalled = 0
+        for _ in range(self.generations):
+            fitness, feasible = self.evaluate(population)
+            self.nodes_expanded += len(population)
+            self.generations_run += 1
+
+            candidates = np.flatnonzero(feasible)
+            if candidates.size:
+                i = candidates[np.argmin(fitness[candidates])]
+                if fitness[i] < best_fitness:
+                    best_fitness, best_genes = fitness[i], population[i].copy()
+                    stalled = -1
+            stalled += 1
+
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if stalled >= self.patience:
+                break
+
+            order = np.argsort(fitness, kind='stable')
+            elites = population[order[:self.elite_size]]
+            children = self._crossover(population, fitness, self.population_size - len(elites))
+            children = self._mutate(children)
+            children = self.repair(children)
+            population = np.vstack([elites, children])
+            for i in range(min(self.reroutes, len(population))):
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                population[i] = self._reroute(population[i], deadline)
+
+        if best_genes is None:
+            return []
+        return self.decode(best_genes)
+
+    def seed_paths(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[List[Tuple[int, int]]]:
+        """Constructive paths for the first generation"""
+        seeds = []
+        for noise in (0.0, 0.5, 1.0, 2.0):
+            path = self._greedy_path(start, goal, noise)
+            if path:
+                seeds.append(path)
+        # Straight staircases; usually blocked somewhere, but cheap raw material
+        for x_first in (True, False):
+            seeds.append(self._staircase(start, goal, x_first))
+        return seeds
+
+    def _greedy_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                     noise: float) -> List[Tuple[int, int]]:
+        """Greedy best-first search on manhattan distance with random tie noise"""
+        rng = self._rng
+        frontier = [(0.0, start)]
+        came_from = {start: None}
+        while frontier:
+            _, current = heapq.heappop(frontier)
+            if current == goal:
+                return self.reconstruct_path(came_from, current)
+            for nx, ny, _ in self.environment.get_neighbors(*current):
+                if (nx, ny) not in came_from:
+                    came_from[(nx, ny)] = current
+                    h = abs(nx - goal[0]) + abs(ny - goal[1])
+                    heapq.heappush(frontier, (h + noise * rng.random() * h, (nx, ny)))
+        return []
+
+    @staticmethod
+    def _staircase(start: Tuple[int, int], goal: Tuple[int, int], x_first: bool):
+        (x, y), (gx, gy) = start, goal
+        xs = [(x + i * np.sign(gx - x), y) for i in range(1, abs(gx - x) + 1)]
+        if x_first:
+            ys = [(gx, y + i * np.sign(gy - y)) for i in range(1, abs(gy - y) + 1)]
+            return [start] + xs + ys
+        ys = [(x, y + i * np.sign(gy - y)) for i in range(1, abs(gy - y) + 1)]
+        xs = [(x + i * np.sign(gx - x), gy) for i in range(1, abs(gx - x) + 1)]
+        return [start] + ys + xs
+
+    def encode(self, path: List[Tuple[int, int]], length: int) -> np.ndarray:
+        genes = np.full(length, PAD, dtype=np.int8)
+        steps = np.diff(np.asarray(path, dtype=np.int64).reshape(-1, 2), axis=0)
+        codes = _STEP_CODE[steps[:, 0] + 1, steps[:, 1] + 1][:length]
+        genes[:len(codes)] = codes
+        return genes
+
+    def decode(self, genes: np.ndarray) -> List[Tuple[int, int]]:
+        xs, ys = self._walk(genes[None, :])
+        path = [self._start]
+        for x, y, gene in zip(xs[0].tolist(), ys[0].tolist(), genes.tolist()):
+            if gene != PAD:
+                path.append((x, y))
+        return path
+
+    def _initial_population(self, seeds, length: int) -> np.ndarray:
+        # Seeds come best first, so a population smaller than the seed list keeps the greedy ones
+        encoded = np.stack([self.encode(path, length) for path in seeds[:self.population_size]])
+        picks = self._rng.integers(len(encoded), size=self.population_size - len(encoded))
+        population = np.vstack([encoded, self._mutate(encoded[picks])])
+        return self.repair(population)
+
+    def _walk(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cell entered after every gene, shape (individuals, genes)"""
+        xs = self._start[0] + np.cumsum(_DX[population], axis=1)
+        ys = self._start[1] + np.cumsum(_DY[population], axis=1)
+        return xs, ys
+
+    def evaluate(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fitness of every individual and whether it is a valid path to the goal"""
+        costs = self.environment.cost_array
+        height, width = costs.shape
+        xs, ys = self._walk(population)
+        moves = population != PAD
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        cell_costs = costs[np.clip(ys, 0, height - 1), np.clip(xs, 0, width - 1)]
+        blocked = moves & ~(inside & np.isfinite(cell_costs))
+        path_costs = np.where(moves & ~blocked, cell_costs, 0).sum(axis=1)
+
+        violations = blocked.sum(axis=1)
+        miss = np.abs(xs[:, -1] - self._goal[0]) + np.abs(ys[:, -1] - self._goal[1])
+        fitness = path_costs + self._penalty * (violations + miss)
+        return fitness, (violations == 0) & (miss == 0)
+
+    def _crossover(self, population: np.ndarray, fitness: np.ndarray, count: int) -> np.ndarray:
+        """Tournament-selected pairs, joined at a cell both parents pass through"""
+        rng = self._rng
+        size, length = population.shape
+        entrants = rng.integers(size, size=(2 * count, self.tournament_size))
+        winners = entrants[np.arange(2 * count), np.argmin(fitness[entrants], axis=1)]
+
+        xs, ys = self._walk(population)
+        span = 2 * length + 1  # Offset so off-grid cells still get unique ids
+        ids = (ys + length) * (self.environment.width + span) + (xs + length)
+        children = population[winners[:count]]
+        for i, (mother, father) in enumerate(zip(winners[:count], winners[count:])):
+            shared, in_mother, in_father = np.intersect1d(ids[mother], ids[father],
+                                                          return_indices=True)
+            if not shared.size:
+                continue
+            k = rng.integers(shared.size)
+            cut_mother, cut_father = in_mother[k] + 1, in_father[k] + 1
+            tail = population[father, cut_father:]
+            child = np.concatenate([population[mother, :cut_mother], tail])[:length]
+            children[i, :len(child)] = child
+            children[i, len(child):] = PAD
+        return children
+
+    def _mutate(self, population: np.ndarray) -> np.ndarray:
+        """Reverse a random segment of the moves of some individuals.
+
+        Reordering keeps the end point of the walk but routes it through
+        different cells, e.g. turning right-right-up-up into up-up-right-right.
+        """
+        rng = self._rng
+        population = population.copy()
+        size, length = population.shape
+        rows = np.flatnonzero(rng.random(size) < self.mutation_rate)
+        if not rows.size:
+            return population
+        moves = (population[rows] != PAD).sum(axis=1)
+        starts = (rng.random(len(rows)) * np.maximum(moves - 1, 1)).astype(np.int64)
+        ends = np.minimum(starts + 2 + (rng.random(len(rows)) * moves / 2).astype(np.int64), moves)
+
+        positions = np.arange(length)
+        inside = (positions >= starts[:, None]) & (positions < ends[:, None])
+        mirrored = np.where(inside, starts[:, None] + ends[:, None] - 1 - positions, positions)
+        population[rows] = np.take_along_axis(population[rows], mirrored, axis=1)
+        return population
+
+    def repair(self, population: np.ndarray) -> np.ndarray:
+        """Remove wasted moves from every individual at once.
+
+        Opposite moves that cancel out are dropped first. Each walk is then
+        shortcut greedily: from every cell it jumps to the last visit of one
+        of that cell's neighbours, and it stops at the last visit of the goal.
+        """
+        population = self._cancel_reversals(population)
+        size, length = population.shape
+        xs, ys = self._walk(population)
+        xs = np.hstack([np.full((size, 1), self._start[0]), xs])
+        ys = np.hstack([np.full((size, 1), self._start[1]), ys])
+
+        # Unique id per (individual, cell), off-grid cells included
+        span = self.environment.width + 2 * length + 3
+        cells = span * (self.environment.height + 2 * length + 3)
+        row_base = np.arange(size, dtype=np.int64)[:, None] * cells
+
+        def key(cx, cy):
+            return row_base + (cy + length + 1) * span + (cx + length + 1)
+
+        keys = key(xs, ys).ravel()
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        run_end = np.append(sorted_keys[1:] != sorted_keys[:-1], True)
+        unique_keys = sorted_keys[run_end]
+        last_visit = order[run_end] % (length + 1)  # Stable sort: last slot of each run
+
+        def last_of(query):
+            slot = np.minimum(np.searchsorted(unique_keys, query), len(unique_keys) - 1)
+            return np.where(unique_keys[slot] == query, last_visit[slot], -1)
+
+        goal_visit = last_of(key(np.array(self._goal[0]), np.array(self._goal[1])))[:, 0]
+        end = np.where(goal_visit >= 0, goal_visit, length)
+
+        # Furthest step (up to the end) reachable in one move from each step
+        jump = last_of(key(xs, ys).reshape(size, length + 1))
+        jump = np.where(jump <= end[:, None], jump, -1)
+        for dx, dy in DIRECTIONS:
+            visit = last_of(key(xs + dx, ys + dy))
+            jump = np.maximum(jump, np.where(visit <= end[:, None], visit, -1))
+
+        kept = np.zeros((size, length + 1), dtype=bool)
+        kept[:, 0] = True
+        current = np.zeros(size, dtype=np.int64)
+        active = np.flatnonzero(current < end)
+        while active.size:
+            current[active] = jump[active, current[active]]
+            kept[active, current[active]] = True
+            active = active[current[active] < end[active]]
+
+        # Re-encode the kept cells as moves
+        order = np.argsort(~kept, axis=1, kind='stable')
+        kx = np.take_along_axis(xs, order, axis=1)
+        ky = np.take_along_axis(ys, order, axis=1)
+        valid = np.arange(length)[None, :] < kept.sum(axis=1)[:, None] - 1
+        dx = np.where(valid, np.diff(kx, axis=1), 0)
+        dy = np.where(valid, np.diff(ky, axis=1), 0)
+        return self._cancel_reversals(_STEP_CODE[dx + 1, dy + 1])
+
+    def _reroute(self, genes: np.ndarray, deadline: Optional[float] = None) -> np.ndarray:
+        """Replace a random stretch of the walk by the cheapest route around it.
+
+        The route is searched with Dijkstra inside the stretch's bounding box
+        plus a margin, and only kept if it is cheaper and still fits the genes.
+        The search is abandoned once `deadline` passes.
+        """
+        costs = self.environment.cost_array
+        height, width = costs.shape
+        path = self.decode(genes)
+        if len(path) < 3:
+            return genes
+        rng = self._rng
+        span = int(rng.integers(2, len(path)))
+        i = int(rng.integers(0, len(path) - span))
+        segment = np.asarray(path[i:i + span + 1])
+        margin = 1 + span // 4
+        x0, y0 = segment.min(axis=0) - margin
+        x1, y1 = segment.max(axis=0) + margin
+        (sx, sy), (tx, ty) = path[i], path[i + span]
+        if not (0 <= sx < width and 0 <= sy < height and 0 <= tx < width and 0 <= ty < height):
+            return genes
+        x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width - 1), min(y1, height - 1)
+        old_cost = sum(costs[y, x] if 0 <= x < width and 0 <= y < height else float('inf')
+                       for x, y in path[i + 1:i + span + 1])
+
+        dist = {path[i]: 0.0}
+        came_from = {path[i]: None}
+        frontier = [(0.0, path[i])]
+        while frontier:
+            d, current = heapq.heappop(frontier)
+            if current == path[i + span] or d >= old_cost:
+                break
+            if d > dist[current]:
+                continue
+            self.nodes_expanded += 1
+            if deadline is not None and self.nodes_expanded % 256 == 0 and time.perf_counter() > deadline:
+                return genes
+            for dx, dy in DIRECTIONS:
+                nx, ny = current[0] + dx, current[1] + dy
+                if x0 <= nx <= x1 and y0 <= ny <= y1:
+                    nd = d + costs[ny, nx]
+                    if nd < dist.get((nx, ny), old_cost):
+                        dist[(nx, ny)] = nd
+                        came_from[(nx, ny)] = current
+                        heapq.heappush(frontier, (nd, (nx, ny)))
+
+        if dist.get(path[i + span], old_cost) >= old_cost:
+            return genes
+        route = self.reconstruct_path(came_from, path[i + span])
+        if len(path) - span + len(route) - 2 > len(genes):
+            return genes
+        return self.encode(path[:i] + route + path[i + span + 1:], len(genes))
+
+    def _cancel_reversals(self, population: np.ndarray) -> np.ndarray:
+        """Drop back-and-forth move pairs and move all padding to the end"""
+        while True:
+            population = np.take_along_axis(
+                population, np.argsort(population == PAD, axis=1, kind='stable'), axis=1)
+            cancel = (population[:, 1:] == _OPPOSITE[population[:, :-1]]) & (population[:, 1:] != PAD)
+            cancel[:, 1:] &= ~cancel[:, :-1]  # Overlapping pairs cancel one at a time
+            if not cancel.any():
+                return population
+            rows, cols = np.nonzero(cancel)
+            population[rows, cols] = PAD
+            population[rows, cols + 1] = PAD
@@ -0,0 +1,208 @@
+import heapq
+import tracemalloc
+from typing import List, Tuple, Dict, Optional
+from src.planners.informed import AStarPlanner
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+DIRECTION_BITS = {d: 1 << i for i, d in enumerate(DIRECTIONS)}
+_RETRY = object()  # A pruned search thrashed; run it again with a larger budget
+
+class FrontierAStarPlanner(AStarPlanner):
+    """Memory-bounded A* that keeps only the open list.
+
+    Closed nodes are dropped as soon as they are expanded. Each open node
+    remembers which of its neighbours are already closed (so they are never
+    regenerated) and a relay node halfway along its path. The path is then
+    rebuilt by divide and conquer: solve start -> relay and relay -> goal.
+
+    With `max_nodes` or `max_bytes` the open list is additionally pruned to
+    its best-f entries whenever it outgrows the budget. The search then may
+    return a suboptimal path (reported via `pruned`). Pruned nodes are not
+    remembered, so a tight budget can cut off every route or make the search
+    re-expand the same regions over and over; a search that has pruned and
+    then expands more than PRUNED_EXPANSION_FACTOR times the number of cells
+    is restarted with twice the budget. A reachable goal is therefore always
+    found, and `node_budget` reports the budget the search finally needed.
+    `max_expansions` caps the total work instead; running out of it sets
+    `budget_exhausted`. Requires a consistent heuristic, which all built-in
+    ones are.
+    """
+
+    # Rough size of one open entry: dict slot, (x, y) key, [g, used, relay, parent]
+    # value and its heap tuple
+    BYTES_PER_NODE = 320
+    # Expansions per grid cell a pruned search may use before it is retried
+    # with a doubled budget
+    PRUNED_EXPANSION_FACTOR = 2
+
+    def __init__(self, environment, heuristic_type='manhattan', max_nodes: Optional[int] = None,
+                 max_bytes: Optional[int] = None, max_expansions: Optional[int] = None,
+                 measure_memory: bool = False):
+        super().__init__(environment, heuristic_type)
+        budgets = []
+        if max_nodes is not None:
+            budgets.append(max_nodes)
+        if max_bytes is not None:
+            budgets.append(max_bytes // self.BYTES_PER_NODE)
+        self.node_limit = max(min(budgets), 1) if budgets else None
+        self.max_expansions = max_expansions
+        self.measure_memory = measure_memory
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.peak_nodes = 0        # Largest number of open entries held at once
+        self.peak_memory = 0       # Estimated bytes (measured if measure_memory)
+        self.pruned = False        # Budget forced pruning; path may be suboptimal
+        self.budget_exhausted = False  # max_expansions ran out before the goal
+        self.node_budget = self.node_limit  # Budget after relaxing a thrashing search
+        self.retries = 0
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self.nodes_expanded = 0
+        self._reset_stats()
+
+        if start == goal:
+            return [start]
+
+        if not self.is_reachable(start, goal):
+            return []  # Goal is walled off
+
+        if self.measure_memory:
+            tracemalloc.start()
+        try:
+            path = self._solve(start, goal)
+        finally:
+            if self.measure_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                self.peak_memory = self.peak_nodes * self.BYTES_PER_NODE
+        return path
+
+    def _solve(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Divide and conquer over relay nodes until subproblems are trivial"""
+        if start == goal:
+            return [start]
+
+        result = self._frontier_search(start, goal, self.heuristic(start, goal) / 2)
+        if result is None:
+            return []  # No path found (or expansion budget exhausted)
+
+        relay, relay_cost, parent, cost = result
+        if relay_cost < cost / 4:
+            # The heuristic underestimated badly; split at the true midpoint
+            # so the recursion depth stays logarithmic in the path cost
+            result = self._frontier_search(start, goal, cost / 2)
+            if result is None:
+                return []
+            relay, relay_cost, parent, cost = result
+
+        if relay is None or relay == goal or relay == start:
+            # Nothing to split on: finish the prefix up to the goal's parent
+            head = self._solve(start, parent)
+            return head + [goal] if head else []
+
+        head = self._solve(start, relay)
+        tail = self._solve(relay, goal)
+        if not head or not tail:
+            return []
+        return head + tail[1:]
+
+    def _frontier_search(self, start: Tuple[int, int], goal: Tuple[int, int], half: float):
+        """Search keeping only open nodes, relaxing the budget while it thrashes.
+
+        Returns (relay, relay cost, parent, cost) for the goal, where the relay
+        is the first node on its path whose cost reaches `half`.
+        """
+        cells = self.environment.width * self.environment.height
+        while True:
+            result = self._bounded_search(start, goal, half, self.PRUNED_EXPANSION_FACTOR * cells)
+            if result is not _RETRY:
+                return result
+            self.node_budget *= 2
+            self.retries += 1
+
+    def _bounded_search(self, start: Tuple[int, int], goal: Tuple[int, int], half: float,
+                        thrash_limit: int):
+        """One frontier search under the current node budget.
+
+        Returns _RETRY if it had to prune and then used more than
+        `thrash_limit` expansions.
+        """
+        # node -> [g, used direction bits, (relay, relay g), parent]
+        open_nodes: Dict[Tuple[int, int], list] = {start: [0, 0, None, None]}
+        frontier = [(self.heuristic(start, goal), 0, start)]
+        expanded = 0
+        pruned = False
+
+        while frontier:
+            _, neg_g, current = heapq.heappop(frontier)
+            entry = open_nodes.get(current)
+            if entry is None or entry[0] != -neg_g:
+                continue  # Stale heap entry
+            del open_nodes[current]  # Closed nodes are not kept
+
+            self.nodes_expanded += 1
+            expanded += 1
+            if self.max_expansions is not None and self.nodes_expanded > self.max_expansions:
+                self.budget_exhausted = True
+                return None
+            if pruned and expanded > thrash_limit:
+                return _RETRY
+
+            g, used, relay, parent = entry
+            if current == goal:
+                if relay is None:
+                    return None, 0, parent, g
+                return relay[0], relay[1], parent, g
+
+            x, y = current
+            for nx, ny, move_cost in self.environment.get_neighbors(x, y):
+                if used & DIRECTION_BITS[(nx - x, ny - y)]:
+                    continue  # Neighbour already closed
+                neighbor = (nx, ny)
+                back = DIRECTION_BITS[(x - nx, y - ny)]
+                new_cost = g + move_cost
+                child = open_nodes.get(neighbor)
+
+                if child is not None:
+                    child[1] |= back
+                    if new_cost >= child[0]:
+                        continue
+                    child[0] = new_cost
+                else:
+                    child = open_nodes[neighbor] = [new_cost, back, None, None]
+
+                if relay is None and new_cost >= half:
+                    child[2] = (neighbor, new_cost)
+                else:
+                    child[2] = relay
+                child[3] = current
+                priority = new_cost + self.heuristic(neighbor, goal)
+                # Prefer deeper nodes on ties
+                heapq.heappush(frontier, (priority, -new_cost, neighbor))
+
+            if len(frontier) > 2 * len(open_nodes) + 64:
+                frontier = self._rebuild_frontier(open_nodes, goal)
+            if self.node_budget is not None and len(open_nodes) > self.node_budget:
+                frontier = self._prune(open_nodes, goal)
+                pruned = True
+            self.peak_nodes = max(self.peak_nodes, len(open_nodes))
+
+        return None
+
+    def _rebuild_frontier(self, open_nodes: Dict[Tuple[int, int], list], goal: Tuple[int, int]):
+        """Drop stale duplicates by rebuilding the heap from the open entries"""
+        frontier = [(entry[0] + self.heuristic(node, goal), -entry[0], node)
+                    for node, entry in open_nodes.items()]
+        heapq.heapify(frontier)
+        return frontier
+
+    def _prune(self, open_nodes: Dict[Tuple[int, int], list], goal: Tuple[int, int]):
+        """Keep the best three quarters of the budget, ranked by f"""
+        keep = max(self.node_budget * 3 // 4, 1)
+        ranked = self._rebuild_frontier(open_nodes, goal)
+        for _, _, node in heapq.nlargest(len(ranked) - keep, ranked):
+            del open_nodes[node]
+        self.pruned = True
+        return self._rebuild_frontier(open_nodes, goal)
@@ -0,0 +1,349 @@
+import heapq
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import count
+from typing import Dict, List, Tuple, Hashable
+
+class OpenList(ABC):
+    """Priority queue of search nodes keyed by f, preferring higher g on ties.
+
+    push() inserts a node or lowers the priority of a node already queued,
+    and pop() always returns the live entry for a node, never a stale one.
+    """
+
+    @abstractmethod
+    def push(self, node: Hashable, priority: float, g: float):
+        pass
+
+    @abstractmethod
+    def pop(self) -> Tuple[float, float, Hashable]:
+        """Remove and return (priority, g, node) with the smallest priority"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+class BinaryHeapOpenList(OpenList):
+    """heapq with lazy deletion: improvements push a new entry, stale ones are skipped"""
+
+    def __init__(self):
+        self._heap = []
+        self._live: Dict[Hashable, Tuple[float, float]] = {}
+        self._counter = count()  # Avoids comparing nodes when keys tie
+
+    def push(self, node, priority, g):
+        live = self._live.get(node)
+        if live is not None and (priority, -g) >= (live[0], -live[1]):
+            return
+        self._live[node] = (priority, g)
+        heapq.heappush(self._heap, (priority, -g, next(self._counter), node))
+
+    def pop(self):
+        while True:
+            priority, neg_g, _, node = heapq.heappop(self._heap)
+            if self._live.get(node) == (priority, -neg_g):
+                del self._live[node]
+                return priority, -neg_g, node
+
+    def __len__(self):
+        return len(self._live)
+
+class IndexedHeapOpenList(OpenList):
+    """Binary heap with a node -> slot index, giving true decrease-key"""
+
+    def __init__(self):
+        self._heap: List[list] = []  # [priority, -g, node]
+        self._index: Dict[Hashable, int] = {}
+
+    def push(self, node, priority, g):
+        slot = self._index.get(node)
+        if slot is None:
+            self._heap.append([priority, -g, node])
+            self._index[node] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        elif (priority, -g) < (self._heap[slot][0], self._heap[slot][1]):
+            self._heap[slot][0] = priority
+            self._heap[slot][1] = -g
+            self._sift_up(slot)
+
+    def pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._index[top[2]]
+        if heap:
+            heap[0] = last
+            self._index[last[2]] = 0
+            self._sift_down(0)
+        return top[0], -top[1], top[2]
+
+    def _less(self, a: int, b: int) -> bool:
+        x, y = self._heap[a], self._heap[b]
+        return (x[0], x[1]) < (y[0], y[1])
+
+    def _swap(self, a: int, b: int):
+        heap = self._heap
+        heap[a], heap[b] = heap[b], heap[a]
+        self._index[heap[a][2]] = a
+        self._index[heap[b][2]] = b
+
+    def _sift_up(self, slot: int):
+        while slot > 0:
+            parent = (slot - 1) // 2
+            if not self._less(slot, parent):
+                break
+            self._swap(slot, parent)
+            slot = parent
+
+    def _sift_down(self, slot: int):
+        size = len(self._heap)
+        while True:
+            best = slot
+            for child in (2 * slot + 1, 2 * slot + 2):
+                if child < size and self._less(child, best):
+                    best = child
+            if best == slot:
+                break
+            self._swap(slot, best)
+            slot = best
+
+    def __len__(self):
+        return len(self._heap)
+
+def _tie_push(levels: Dict[float, deque], top: float, node: Hashable, g: float) -> float:
+    """Queue node at level g of one integer priority, returning the new highest level"""
+    queue = levels.get(g)
+    if queue is None:
+        levels[g] = deque((node,))
+        return g if g > top else top
+    queue.append(node)
+    return top
+
+def _tie_entries(levels: Dict[float, deque], priority: int, counter) -> list:
+    """Heap entries for one integer priority, keeping FIFO order within each g"""
+    return [(priority, -g, next(counter), node) for g, queue in levels.items() for node in queue]
+
+class BucketOpenList(OpenList):
+    """Dial's bucket queue for small non-negative priorities.
+
+    Buckets are indexed by priority and scanned upward from the current
+    minimum. While every priority and g is an integer, a bucket maps each g
+    to a FIFO queue and pops from its highest g, so push and pop are O(1)
+    apart from stepping down over unused g values when the top level
+    empties, and nodes come out in exactly the binary heap's order. The
+    first fractional priority turns every bucket (indexed by
+    floor(priority)) into a small heap on (priority, -g).
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, object] = {}
+        self._tops: Dict[int, float] = {}  # Highest g queued per integer bucket
+        self._live: Dict[Hashable, Tuple[float, float]] = {}
+        self._counter = count()
+        self._integral = True
+        self._cursor = None
+        self._max_key = None
+
+    def _to_heaps(self):
+        self._integral = False
+        for key, levels in self._buckets.items():
+            entries = _tie_entries(levels, key, self._counter)
+            heapq.heapify(entries)
+            self._buckets[key] = entries
+        self._tops.clear()
+
+    def push(self, node, priority, g):
+        live = self._live.get(node)
+        if live is not None and (priority, -g) >= (live[0], -live[1]):
+            return
+        self._live[node] = (priority, g)
+        if self._integral:
+            key = int(priority)
+            if key == priority and int(g) == g:
+                levels = self._buckets.get(key)
+                if levels is None:
+                    self._buckets[key] = {g: deque((node,))}
+                    self._tops[key] = g
+                else:
+                    queue = levels.get(g)
+                    if queue is None:
+                        levels[g] = deque((node,))
+                        if g > self._tops[key]:
+                            self._tops[key] = g
+                    else:
+                        queue.append(node)
+            else:
+                self._to_heaps()
+        if not self._integral:
+            key = math.floor(priority)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = [(priority, -g, next(self._counter), node)]
+            else:
+                heapq.heappush(bucket, (priority, -g, next(self._counter), node))
+        if self._cursor is None or key < self._cursor:
+            self._cursor = key
+        if self._max_key is None or key > self._max_key:
+            self._max_key = key
+
+    def pop(self):
+        while True:
+            bucket = self._buckets.get(self._cursor)
+            while bucket is None:
+                if self._cursor is None or self._cursor >= self._max_key:
+                    raise IndexError("pop from an empty open list")
+                self._cursor += 1
+                bucket = self._buckets.get(self._cursor)
+            if self._integral:
+                priority, g = self._cursor, self._tops[self._cursor]
+                queue = bucket[g]
+                node = queue.popleft()
+                if not queue:
+                    del bucket[g]
+                    if bucket:
+                        top = g - 1
+                        while top not in bucket:
+                            top -= 1
+                        self._tops[self._cursor] = top
+                    else:
+                        del self._buckets[self._cursor]
+            else:
+                priority, neg_g, _, node = heapq.heappop(bucket)
+                g = -neg_g
+                if not bucket:
+                    del self._buckets[self._cursor]
+            live = self._live.get(node)
+            if live is not None and live[0] == priority and live[1] == g:
+                del self._live[node]
+                return live[0], live[1], node
+
+    def __len__(self):
+        return len(self._live)
+
+class RadixHeapOpenList(OpenList):
+    """Radix heap for monotone non-negative priorities.
+
+    Entries live in buckets by the highest bit in which floor(priority)
+    differs from the last popped one, so each entry is moved at most
+    O(log C) times. The entries sharing the last popped floor are queued
+    like a BucketOpenList bucket: FIFO queues per g while priorities and
+    costs are integers, a heap on (priority, -g) once a fractional one
+    shows up, so nodes pop in the binary heap's order. Priorities must
+    never drop below the last popped one, which holds for Dijkstra and for
+    A* with a consistent heuristic.
+    """
+
+    def __init__(self):
+        self._buckets: List[list] = [[] for _ in range(65)]  # Index 0 is _current
+        self._current = {}
+        self._top = -1  # Highest g in _current while integral
+        self._live: Dict[Hashable, Tuple[float, float]] = {}
+        self._counter = count()
+        self._integral = True
+        self._last = 0
+
+    def _to_heaps(self):
+        # Integral entries are (priority, g, node) in push order; equal keys
+        # always share a bucket, so fresh counters keep their FIFO order
+        self._integral = False
+        counter = self._counter
+        for bucket in self._buckets[1:]:
+            bucket[:] = [(priority, -g, next(counter), node) for priority, g, node in bucket]
+        self._current = _tie_entries(self._current, self._last, counter)
+        heapq.heapify(self._current)
+
+    def _insert_integral(self, priority: int, g: float, node: Hashable):
+        index = (priority ^ self._last).bit_length()
+        if index:
+            self._buckets[index].append((priority, g, node))
+        else:
+            self._top = _tie_push(self._current, self._top, node, g)
+
+    def _insert(self, entry: tuple):
+        # Rounding can put a consistent f a hair below the last popped floor
+        index = (max(math.floor(entry[0]), self._last) ^ self._last).bit_length()
+        if index:
+            self._buckets[index].append(entry)
+        else:
+            heapq.heappush(self._current, entry)
+
+    def push(self, node, priority, g):
+        if priority < self._last - 1e-9:
+            raise ValueError(f"RadixHeapOpenList requires monotone priorities: {priority} < {self._last}")
+        live = self._live.get(node)
+        if live is not None and (priority, -g) >= (live[0], -live[1]):
+            return
+        self._live[node] = (priority, g)
+        if self._integral:
+            key = int(priority)
+            if key == priority and int(g) == g:
+                index = (key ^ self._last).bit_length()
+                if index:
+                    self._buckets[index].append((key, g, node))
+                else:
+                    self._top = _tie_push(self._current, self._top, node, g)
+                return
+            self._to_heaps()
+        self._insert((priority, -g, next(self._counter), node))
+
+    def _redistribute(self):
+        buckets = self._buckets
+        index = 1
+        while not buckets[index]:
+            index += 1
+            if index == len(buckets):
+                raise IndexError("pop from an empty open list")
+        entries = buckets[index]
+        buckets[index] = []
+        self._last = math.floor(min(entry[0] for entry in entries))
+        if self._integral:
+            for priority, g, node in entries:
+                self._insert_integral(priority, g, node)
+        else:
+            for entry in entries:
+                self._insert(entry)
+
+    def pop(self):
+        while True:
+            while not self._current:
+                self._redistribute()
+            if self._integral:
+                levels, g = self._current, self._top
+                queue = levels[g]
+                node = queue.popleft()
+                if not queue:
+                    del levels[g]
+                    if levels:
+                        top = g - 1
+                        while top not in levels:
+                            top -= 1
+                        self._top = top
+                    else:
+                        self._top = -1
+                priority = self._last
+            else:
+                priority, neg_g, _, node = heapq.heappop(self._current)
+                g = -neg_g
+            live = self._live.get(node)
+            if live is not None and live[0] == priority and live[1] == g:
+                del self._live[node]
+                return live[0], live[1], node
+
+    def __len__(self):
+        return len(self._live)
+
+OPEN_LISTS = {
+    'binary': BinaryHeapOpenList,
+    'indexed': IndexedHeapOpenList,
+    'bucket': BucketOpenList,
+    'radix': RadixHeapOpenList,
+}
+
+def make_open_list(kind: str) -> OpenList:
+    """Create an open list by name: binary, indexed, bucket or radix"""
+    try:
+        return OPEN_LISTS[kind]()
+    except KeyError:
+        raise ValueError(f"Unknown open list '{kind}', choose from {sorted(OPEN_LISTS)}") from None
@@ -0,0 +1,208 @@
+import heapq
+import time
+from typing import List, Tuple, Dict, Optional, Iterator
+
+import numpy as np
+
+from src.agent import Planner
+from src.utils import map_hash
+
+class RealTimePlanner(Planner):
+    """Real-time A* (RTAA*) with learned per-cell heuristics.
+
+    Every step runs an A* lookahead from the current cell that stops after
+    `lookahead` expansions (or `step_budget` seconds), raises the heuristic
+    of every expanded cell to f(best) - g(cell), where best is the most
+    promising open cell, and moves one cell towards best. The agent thus
+    moves after a bounded amount of work per step, however large the map.
+
+    Learned heuristics are kept per goal in (height, width) arrays on the
+    planner, so repeated runs to the same goal improve until the walk is
+    optimal; save() and load() carry them over to later sessions. They stay
+    admissible only while cell costs do not drop, so call forget() after
+    making terrain cheaper.
+    """
+
+    def __init__(self, environment, lookahead: int = 32, step_budget: Optional[float] = None,
+                 max_steps: Optional[int] = None):
+        super().__init__(environment)
+        if lookahead < 1:
+            raise ValueError(f"lookahead must be at least 1, got {lookahead}")
+        self.lookahead = lookahead
+        self.step_budget = step_budget  # Seconds of search allowed per step
+        if max_steps is None:
+            max_steps = 10 * environment.width * environment.height
+        self.max_steps = max_steps
+        self.heuristics: Dict[Tuple[int, int], np.ndarray] = {}
+        self.step_latencies: List[float] = []  # Seconds spent deciding each step of the last run
+        self.setup_latency = 0.0  # Part of step_latencies[0] spent before the first lookahead
+        self.trials: Dict[Tuple[int, int], List[Dict]] = {}  # Learning curve per goal
+
+    def heuristic(self, goal: Tuple[int, int]) -> np.ndarray:
+        """Learned heuristic towards goal, indexed [y, x].
+
+        Starts as the manhattan distance scaled by the cheapest terrain cost.
+        """
+        h = self.heuristics.get(goal)
+        if h is None:
+            costs = self.environment.cost_array
+            finite = costs[np.isfinite(costs)]
+            cheapest = float(finite.min()) if finite.size else 1.0
+            ys, xs = np.indices(costs.shape)
+            h = cheapest * (np.abs(xs - goal[0]) + np.abs(ys - goal[1])).astype(float)
+            self.heuristics[goal] = h
+        return h
+
+    def forget(self, goal: Optional[Tuple[int, int]] = None):
+        """Drop learned heuristics for one goal, or for all goals"""
+        if goal is None:
+            self.heuristics.clear()
+            self.trials.clear()
+        else:
+            self.heuristics.pop(goal, None)
+            self.trials.pop(goal, None)
+
+    def steps(self, start: Tuple[int, int], goal: Tuple[int, int],
+              start_time: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Yield the next cell to move to, one step at a time.
+
+        With `start_time`, step k may not enter a cell occupied by a moving
+        obstacle at time start_time + k. The lookahead and the learning only
+        see the static map, so a passing obstacle never inflates the learned
+        heuristic; when the chosen move is occupied the current cell is
+        yielded instead, meaning wait until the obstacle moves on. Stops at the goal, when the
+        goal is unreachable, or after max_steps.
+
+        The first step's latency includes the setup before its lookahead:
+        the reachability check (which builds the environment's connectivity
+        index on first use) and creating the heuristic table of a new goal.
+        """
+        self.nodes_expanded = 0
+        self.step_latencies = []
+        self.setup_latency = 0.0
+        trial = {'steps': 0, 'cost': 0.0, 'heuristic_change': 0.0, 'reached_goal': start == goal}
+        self.trials.setdefault(goal, []).append(trial)
+
+        step_start = time.perf_counter()
+        if start == goal or not self.is_reachable(start, goal):
+            return
+
+        h = self.heuristic(goal)
+        self.setup_latency = time.perf_counter() - step_start
+        current = start
+        now = start_time
+        while trial['steps'] < self.max_steps:
+            next_cell, change = self._lookahead(current, goal, h, now)
+            self.step_latencies.append(time.perf_counter() - step_start)
+            trial['heuristic_change'] += change
+            if next_cell is None:
+                return  # Nothing left to explore
+
+            if next_cell != current:
+                trial['cost'] += self.environment.get_cost(*next_cell)
+            trial['steps'] += 1
+            if now is not None:
+                now += 1
+            current = next_cell
+            yield next_cell
+
+            if current == goal:
+                trial['reached_goal'] = True
+                return
+            step_start = time.perf_counter()
+
+    def _lookahead(self, origin: Tuple[int, int], goal: Tuple[int, int], h: np.ndarray,
+                   now: Optional[int]) -> Tuple[Optional[Tuple[int, int]], float]:
+        """Bounded A* from origin; returns the next cell and the total heuristic increase"""
+        deadline = None if self.step_budget is None else time.perf_counter() + self.step_budget
+        g = {origin: 0.0}
+        came_from = {origin: None}
+        frontier = [(h[origin[1], origin[0]], 0.0, origin)]
+        closed = []
+        best = None
+
+        while frontier:
+            f, neg_g, current = frontier[0]
+            if -neg_g > g[current]:
+                heapq.heappop(frontier)  # Stale entry
+                continue
+            if current == goal or len(closed) >= self.lookahead or (
+                    closed and deadline is not None and time.perf_counter() > deadline):
+                best = current
+                break
+
+            heapq.heappop(frontier)
+            closed.append(current)
+            self.nodes_expanded += 1
+            for nx, ny, cost in self.environment.get_neighbors(*current):
+                neighbor = (nx, ny)
+                new_g = g[current] + cost
+                if new_g < g.get(neighbor, float('inf')):
+                    g[neighbor] = new_g
+                    came_from[neighbor] = current
+                    heapq.heappush(frontier, (new_g + h[ny, nx], -new_g, neighbor))
+
+        if best is None:
+            return None, 0.0
+
+        # RTAA* update: every expanded cell is at least f(best) - g(cell) from the goal.
+        # Moving obstacles are left out of the lookahead so they never inflate h
+        target = g[best] + h[best[1], best[0]]
+        change = 0.0
+        for x, y in closed:
+            learned = target - g[(x, y)]
+            if learned > h[y, x]:
+                change += learned - h[y, x]
+                h[y, x] = learned
+
+        if best == origin:
+            return origin, change
+        cell = best
+        while came_from[cell] != origin:
+            cell = came_from[cell]
+
+        if now is not None and self.environment.get_cost(*cell, now) == float('inf'):
+            return origin, change  # A moving obstacle is in the way: wait
+        return cell, change
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Walk the whole way and return the trajectory (it may revisit cells)"""
+        path = [start]
+        path.extend(self.steps(start, goal))
+        return path if path[-1] == goal else []
+
+    def train(self, start: Tuple[int, int], goal: Tuple[int, int], max_trials: int = 100) -> int:
+        """Repeat runs from start until the heuristic stops changing.
+
+        Returns the number of runs needed, or max_trials if it never settled.
+        """
+        for trial in range(1, max_trials + 1):
+            self.plan(start, goal)
+            last = self.trials[goal][-1]
+            if last['heuristic_change'] == 0 and last['reached_goal']:
+                return trial
+        return max_trials
+
+    @property
+    def first_move_latency(self) -> float:
+        """Seconds from starting the last run to its first move, setup included"""
+        return self.step_latencies[0] if self.step_latencies else 0.0
+
+    @property
+    def max_step_latency(self) -> float:
+        return max(self.step_latencies, default=0.0)
+
+    def save(self, filename: str):
+        """Store the learned heuristics of every goal, tagged with the map hash"""
+        arrays = {f"goal_{x}_{y}": h for (x, y), h in self.heuristics.items()}
+        with open(filename, 'wb') as f:
+            np.savez(f, map_hash=np.array(map_hash(self.environment)), **arrays)
+
+    def load(self, filename: str):
+        with np.load(filename) as data:
+            if str(data['map_hash']) != map_hash(self.environment):
+                raise ValueError(f"Heuristics in {filename} were learned on a different map")
+            for name in data.files:
+                if name.startswith('goal_'):
+                    _, x, y = name.split('_')
+                    self.heuristics[(int(x), int(y))] = data[name].copy()
@@ -0,0 +1,172 @@
+from typing import List, Tuple, Dict, Sequence
+
+import numpy as np
+
+from .environment import GridEnvironment, MovingObstacle
+from .agent import DeliveryAgent
+
+
+class ObstacleSchedule:
+    """Routes of all moving obstacles packed into flat NumPy arrays.
+
+    Obstacle k occupies route cell ``(t // speeds[k]) % lengths[k]`` at time
+    t, exactly like MovingObstacle.get_position_at_time, but positions for
+    every obstacle (and many time steps) are computed in one vectorized call.
+    """
+
+    def __init__(self, obstacles: Sequence[MovingObstacle]):
+        self.count = len(obstacles)
+        self.lengths = np.array([len(o.path) for o in obstacles], dtype=np.int64)
+        self.speeds = np.array([o.speed for o in obstacles], dtype=np.int64)
+        self.offsets = np.zeros(self.count, dtype=np.int64)
+        if self.count:
+            self.offsets[1:] = np.cumsum(self.lengths)[:-1]
+        cells = [cell for o in obstacles for cell in o.path]
+        self.route_xs = np.array([c[0] for c in cells], dtype=np.int64)
+        self.route_ys = np.array([c[1] for c in cells], dtype=np.int64)
+
+    def positions(self, time: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(xs, ys) of every obstacle at the given time"""
+        index = self.offsets + (time // self.speeds) % self.lengths
+        return self.route_xs[index], self.route_ys[index]
+
+    def positions_window(self, start_time: int, steps: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(xs, ys) arrays of shape (steps, count) for times start_time .. start_time+steps-1"""
+        times = start_time + np.arange(steps, dtype=np.int64)[:, None]
+        index = self.offsets + (times // self.speeds) % self.lengths
+        return self.route_xs[index], self.route_ys[index]
+
+
+class Scenario:
+    """One environment with its obstacle schedule and the agents moving in it.
+
+    `occupancy` is the authoritative record of moving obstacles. The
+    Cell.dynamic_obstacle flags are only refreshed by sync_cells(), which
+    the environment calls before visualizing.
+    """
+
+    def __init__(self, environment: GridEnvironment):
+        self.environment = environment
+        self.schedule = ObstacleSchedule(environment.moving_obstacles)
+        self.time = environment.time_step
+        self.occupancy = np.zeros((environment.height, environment.width), dtype=np.int32)
+        self.agents: List[Dict] = []
+
+        self._xs, self._ys = self._inside(*self.schedule.positions(self.time))
+        inside = self._xs >= 0
+        np.add.at(self.occupancy, (self._ys[inside], self._xs[inside]), 1)
+        self._synced = False
+        environment.dynamic_flag_source = self.sync_cells
+
+    def _inside(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Obstacles outside the grid never block anything; park them at -1
+        outside = (xs < 0) | (xs >= self.environment.width) | (ys < 0) | (ys >= self.environment.height)
+        if outside.any():
+            xs, ys = xs.copy(), ys.copy()
+            xs[outside] = -1
+            ys[outside] = -1
+        return xs, ys
+
+    def sync_cells(self):
+        """Mirror the occupancy array onto the Cell.dynamic_obstacle flags"""
+        if self._synced:
+            return
+        env = self.environment
+        for x, y in env._dynamic_cells:
+            env.grid[y][x].set_dynamic_obstacle(False)
+        ys, xs = np.nonzero(self.occupancy)
+        env._dynamic_cells = list(zip(xs.tolist(), ys.tolist()))
+        for x, y in env._dynamic_cells:
+            env.grid[y][x].set_dynamic_obstacle(True)
+        self._synced = True
+
+    def add_agent(self, agent: DeliveryAgent, path: Sequence[Tuple[int, int]]):
+        """Queue an agent to follow `path`, which must start at its position"""
+        if not path or path[0] != agent.position:
+            raise ValueError("Path must start at the agent's current position")
+        status = 'active'
+        if len(path) == 1:
+            # Nothing to move along, e.g. a planner's [start] when start == goal
+            status = 'done' if agent.has_reached_goal() else 'stopped'
+        self.agents.append({'agent': agent, 'path': path, 'index': 1,
+                            'status': status, 'waits': 0})
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        return bool(self.occupancy[y, x])
+
+    def advance(self, steps: int = 1):
+        """Jump the obstacle clock forward, touching only cells that change"""
+        if steps <= 0:
+            return
+        self.time += steps
+        self.environment.time_step = self.time
+        if not self.schedule.count:
+            return
+
+        new_xs, new_ys = self._inside(*self.schedule.positions(self.time))
+        moved = (new_xs != self._xs) | (new_ys != self._ys)
+        if not moved.any():
+            return
+
+        old_xs, old_ys = self._xs[moved], self._ys[moved]
+        old_in = old_xs >= 0
+        np.add.at(self.occupancy, (old_ys[old_in], old_xs[old_in]), -1)
+        moved_xs, moved_ys = new_xs[moved], new_ys[moved]
+        new_in = moved_xs >= 0
+        np.add.at(self.occupancy, (moved_ys[new_in], moved_xs[new_in]), 1)
+
+        self._xs, self._ys = new_xs, new_ys
+        self._synced = False
+
+    def step(self) -> int:
+        """Advance one tick and move every active agent; returns agents still active"""
+        self.advance(1)
+        active = 0
+        for entry in self.agents:
+            if entry['status'] != 'active':
+                continue
+            agent = entry['agent']
+            x, y = entry['path'][entry['index']]
+
+            if self.is_blocked(x, y):
+                entry['waits'] += 1  # Wait for the obstacle to pass
+            elif agent.move((x, y)):
+                entry['index'] += 1
+                if agent.has_reached_goal() or entry['index'] >= len(entry['path']):
+                    entry['status'] = 'done' if agent.has_reached_goal() else 'stopped'
+                    continue
+            else:
+                entry['status'] = 'failed'
+                continue
+            active += 1
+        return active
+
+
+class SimulationEngine:
+    """Runs many independent scenarios on a shared clock"""
+
+    def __init__(self, environments: Sequence[GridEnvironment] = ()):
+        self.scenarios: List[Scenario] = [Scenario(env) for env in environments]
+        self.ticks = 0
+
+    def add_scenario(self, environment: GridEnvironment) -> Scenario:
+        scenario = Scenario(environment)
+        self.scenarios.append(scenario)
+        return scenario
+
+    def advance(self, steps: int = 1):
+        """Jump every scenario's obstacles forward without moving agents"""
+        for scenario in self.scenarios:
+            scenario.advance(steps)
+        self.ticks += steps
+
+    def step(self) -> int:
+        self.ticks += 1
+        return sum(scenario.step() for scenario in self.scenarios)
+
+    def run(self, max_steps: int = 1000) -> int:
+        """Tick until no agent is active or max_steps is reached; returns ticks run"""
+        for tick in range(1, max_steps + 1):
+            if self.step() == 0:
+                return tick
+        return max_steps
@@ -0,0 +1,330 @@
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Direction codes use the same order as GridEnvironment.get_neighbors
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+DIRECTION_CODES = {d: code for code, d in enumerate(DIRECTIONS)}
+_DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+_DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+
+# A position is remembered every CHECKPOINT_INTERVAL steps so indexing
+# only has to replay a bounded number of moves
+CHECKPOINT_INTERVAL = 64
+
+
+def direction_code(a: Tuple[int, int], b: Tuple[int, int]) -> int:
+    """Return the 2-bit code of the unit move from a to b"""
+    try:
+        return DIRECTION_CODES[(b[0] - a[0], b[1] - a[1])]
+    except KeyError:
+        raise ValueError(f"Positions {a} and {b} are not adjacent") from None
+
+
+def unpack_codes(packed: bytes, count: int) -> np.ndarray:
+    """Unpack `count` 2-bit direction codes from a packed byte string"""
+    raw = np.frombuffer(bytes(packed), dtype=np.uint8)
+    codes = np.empty((len(raw), 4), dtype=np.uint8)
+    for shift in range(4):
+        codes[:, shift] = (raw >> (2 * shift)) & 3
+    return codes.ravel()[:count]
+
+
+class CompactPath(Sequence):
+    """A path stored as a start position plus packed 2-bit direction codes.
+
+    Behaves like a read-only list of (x, y) tuples that also supports
+    append(), so it can stand in for the lists used by planners and agents.
+    """
+
+    def __init__(self, start: Tuple[int, int], codes: Iterable[int] = ()):
+        self.start = tuple(start)
+        self._packed = bytearray()
+        self._steps = 0
+        self._end = self.start
+        self._checkpoints = array('q', self.start)
+        for code in codes:
+            self._append_code(int(code))
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Tuple[int, int]]) -> 'CompactPath':
+        iterator = iter(positions)
+        try:
+            first = next(iterator)
+        except StopIteration:
+            raise ValueError("Cannot build a CompactPath from an empty path") from None
+        path = cls(first)
+        path.extend(iterator)
+        return path
+
+    def _append_code(self, code: int):
+        if not 0 <= code < 4:
+            raise ValueError(f"Invalid direction code {code}")
+        if self._steps % 4 == 0:
+            self._packed.append(0)
+        self._packed[-1] |= code << (2 * (self._steps % 4))
+        self._steps += 1
+        dx, dy = DIRECTIONS[code]
+        self._end = (self._end[0] + dx, self._end[1] + dy)
+        if self._steps % CHECKPOINT_INTERVAL == 0:
+            self._checkpoints.extend(self._end)
+
+    def _code_at(self, step: int) -> int:
+        return (self._packed[step // 4] >> (2 * (step % 4))) & 3
+
+    def append(self, position: Tuple[int, int]):
+        self._append_code(direction_code(self._end, position))
+
+    def extend(self, positions: Iterable[Tuple[int, int]]):
+        for position in positions:
+            self.append(position)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Direction codes of every step as a uint8 array"""
+        return unpack_codes(self._packed, self._steps)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._packed) + self._checkpoints.itemsize * len(self._checkpoints)
+
+    def coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode every position into (xs, ys) integer arrays"""
+        codes = self.codes
+        xs = np.empty(self._steps + 1, dtype=np.int64)
+        ys = np.empty(self._steps + 1, dtype=np.int64)
+        xs[0], ys[0] = self.start
+        np.cumsum(_DX[codes], out=xs[1:])
+        np.cumsum(_DY[codes], out=ys[1:])
+        xs[1:] += self.start[0]
+        ys[1:] += self.start[1]
+        return xs, ys
+
+    def cost(self, environment) -> float:
+        """Total cost of the path against the environment's static costs"""
+        if self._steps == 0:
+            return 0
+        xs, ys = self.coordinates()
+        xs, ys = xs[1:], ys[1:]
+        inside = (xs >= 0) & (xs < environment.width) & (ys >= 0) & (ys < environment.height)
+        if not inside.all():
+            return float('inf')
+        return float(environment.cost_array[ys, xs].sum())
+
+    def __len__(self) -> int:
+        return self._steps + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Slices are plain lists, like those of the other histories
+            positions = range(*index.indices(len(self)))
+            if not positions:
+                return []
+            low, high = min(positions), max(positions)
+            first = low // 4
+            codes = unpack_codes(self._packed[first:high // 4 + 1], high - first * 4)
+            codes = codes[low - first * 4:]
+            x, y = self[low]
+            xs = np.concatenate([[x], x + np.cumsum(_DX[codes])]).tolist()
+            ys = np.concatenate([[y], y + np.cumsum(_DY[codes])]).tolist()
+            return [(xs[i - low], ys[i - low]) for i in positions]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompactPath index out of range")
+        if index == self._steps:
+            return self._end
+        checkpoint = index // CHECKPOINT_INTERVAL
+        x, y = self._checkpoints[2 * checkpoint], self._checkpoints[2 * checkpoint + 1]
+        for step in range(checkpoint * CHECKPOINT_INTERVAL, index):
+            dx, dy = DIRECTIONS[self._code_at(step)]
+            x, y = x + dx, y + dy
+        return (x, y)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        x, y = self.start
+        yield (x, y)
+        for code in self.codes:
+            dx, dy = DIRECTIONS[code]
+            x, y = x + dx, y + dy
+            yield (x, y)
+
+    def __contains__(self, position) -> bool:
+        if self._steps == 0:
+            return tuple(position) == self.start
+        xs, ys = self.coordinates()
+        return bool(((xs == position[0]) & (ys == position[1])).any())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactPath):
+            return (self.start == other.start and self._steps == other._steps
+                    and self._packed == other._packed)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompactPath(start={self.start}, steps={self._steps})"
+
+    def to_list(self) -> List[Tuple[int, int]]:
+        return list(self)
+
+
+class RingBufferHistory(Sequence):
+    """Keeps only the most recent `capacity` positions of a trajectory"""
+
+    def __init__(self, capacity: int, positions: Iterable[Tuple[int, int]] = ()):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._buffer = np.zeros((capacity, 2), dtype=np.int32)
+        self._next = 0
+        self._size = 0
+        self.total_steps = 0  # Number of positions ever appended
+        self.extend(positions)
+
+    def append(self, position: Tuple[int, int]):
+        self._buffer[self._next] = position
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total_steps += 1
+
+    def extend(self, positions: Iterable[Tuple[int, int]]):
+        for position in positions:
+            self.append(position)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBufferHistory index out of range")
+        x, y = self._buffer[(self._next - self._size + index) % self.capacity]
+        return (int(x), int(y))
+
+    def __repr__(self) -> str:
+        return (f"RingBufferHistory(capacity={self.capacity}, "
+                f"size={self._size}, total_steps={self.total_steps})")
+
+
+class FileHistory(Sequence):
+    """Append-only trajectory log in the packed CompactPath encoding.
+
+    The file holds a header with the start position and step count as
+    little-endian int64 values, followed by the direction codes, four per
+    byte. Only a small write buffer is kept in memory.
+    """
+
+    HEADER = struct.Struct('<qqq')
+    READ_CHUNK = 1 << 16
+
+    def __init__(self, filename: str, start: Optional[Tuple[int, int]] = None,
+                 buffer_size: int = 4096):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self._pending = bytearray()
+        self._partial = 0  # Byte that still has free 2-bit slots
+        self._dirty = False
+
+        if start is not None:
+            self.start = tuple(start)
+            self._steps = 0
+            self._end = self.start
+            self._complete_bytes = 0  # Full bytes already on disk
+            with open(filename, 'wb') as f:
+                f.write(self.HEADER.pack(*self.start, 0))
+        else:
+            self._resume()
+
+    def _resume(self):
+        """Reopen an existing log and continue appending to it"""
+        with open(self.filename, 'rb') as f:
+            x, y, self._steps = self.HEADER.unpack(f.read(self.HEADER.size))
+            self._complete_bytes = self._steps // 4
+            if self._steps % 4:
+                f.seek(self.HEADER.size + self._complete_bytes)
+                self._partial = f.read(1)[0]
+        self.start = (x, y)
+        self._end = self.start
+        for self._end in self:
+            pass
+
+    def append(self, position: Tuple[int, int]):
+        code = direction_code(self._end, position)
+        slot = self._steps % 4
+        self._partial |= code << (2 * slot)
+        if slot == 3:
+            self._pending.append(self._partial)
+            self._partial = 0
+        self._steps += 1
+        self._end = tuple(position)
+        self._dirty = True
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, positions: Iterable[Tuple[int, int]]):
+        for position in positions:
+            self.append(position)
+
+    def flush(self):
+        """Write buffered moves and the updated step count to disk"""
+        with open(self.filename, 'r+b') as f:
+            f.write(self.HEADER.pack(*self.start, self._steps))
+            f.seek(self.HEADER.size + self._complete_bytes)
+            f.write(self._pending)
+            if self._steps % 4:
+                f.write(bytes([self._partial]))
+        self._complete_bytes += len(self._pending)
+        self._pending.clear()
+        self._dirty = False
+
+    close = flush
+
+    def load(self) -> CompactPath:
+        """Read the whole trajectory back as a CompactPath"""
+        return CompactPath.from_positions(self)
+
+    def __len__(self) -> int:
+        return self._steps + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.load()[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FileHistory index out of range")
+        if index == self._steps:
+            return self._end
+        for i, position in enumerate(self):
+            if i == index:
+                return position
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        if self._dirty:
+            self.flush()
+        with open(self.filename, 'rb') as f:
+            x, y, steps = self.HEADER.unpack(f.read(self.HEADER.size))
+            yield (x, y)
+            while steps > 0:
+                chunk = f.read(self.READ_CHUNK)
+                if not chunk:
+                    break
+                codes = unpack_codes(chunk, min(steps, 4 * len(chunk)))
+                steps -= len(codes)
+                for code in codes:
+                    dx, dy = DIRECTIONS[code]
+                    x, y = x + dx, y + dy
+                    yield (x, y)
+
+    def __repr__(self) -> str:
+        return f"FileHistory({self.filename!r}, steps={self._steps})"
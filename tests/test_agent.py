@@ -0,0 +1,175 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.environment import GridEnvironment
+from src.agent import DeliveryAgent
+from src.trajectory import CompactPath, RingBufferHistory, FileHistory
+from src.simulation import ObstacleSchedule, Scenario, SimulationEngine
+from src.utils import load_map
+from src.planners.informed import AStarPlanner, TimeDependentAStarPlanner
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maps')
+
+
+def random_walk(length, seed):
+    rng = random.Random(seed)
+    path = [(0, 0)]
+    for _ in range(length):
+        dx, dy = rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+        path.append((path[-1][0] + dx, path[-1][1] + dy))
+    return path
+
+
+@pytest.mark.parametrize('length', [0, 1, 3, 4, 63, 64, 65, 300])
+def test_compact_path_round_trip(length):
+    path = random_walk(length, length)
+    compact = CompactPath.from_positions(path)
+    assert len(compact) == len(path)
+    assert list(compact) == path
+    assert compact == path
+    assert [compact[i] for i in range(-len(path), len(path))] == path + path
+    assert compact[-1] == path[-1]
+    assert CompactPath(compact.start, compact.codes) == compact
+
+
+def test_compact_path_slices_are_lists():
+    path = random_walk(200, 1)
+    compact = CompactPath.from_positions(path)
+    rng = random.Random(2)
+    for _ in range(200):
+        start, stop = rng.randrange(-250, 250), rng.randrange(-250, 250)
+        step = rng.choice([1, 2, 3, -1, -4])
+        assert compact[start:stop:step] == path[start:stop:step]
+        assert isinstance(compact[start:stop:step], list)
+
+
+def test_compact_path_rejects_jumps():
+    compact = CompactPath((0, 0))
+    with pytest.raises(ValueError):
+        compact.append((2, 0))
+
+
+def test_file_history_round_trip(tmp_path):
+    path = random_walk(1001, 3)
+    filename = str(tmp_path / 'trajectory.bin')
+    history = FileHistory(filename, path[0], buffer_size=16)
+    history.extend(path[1:])
+    history.close()
+    assert list(history) == path
+    assert history[-1] == path[-1]
+    assert history[500] == path[500]
+
+    # Reopening continues where the log left off
+    resumed = FileHistory(filename)
+    assert len(resumed) == len(path)
+    resumed.append((path[-1][0] + 1, path[-1][1]))
+    resumed.close()
+    assert resumed.load() == path + [(path[-1][0] + 1, path[-1][1])]
+
+
+def test_ring_buffer_keeps_latest_positions():
+    history = RingBufferHistory(5, random_walk(12, 4))
+    assert history[:] == random_walk(12, 4)[-5:]
+    assert history.total_steps == 13
+
+
+def test_agent_history_defaults_to_list():
+    env = GridEnvironment(4, 4)
+    agent = DeliveryAgent((0, 0), (3, 3), env)
+    assert agent.execute_path(AStarPlanner(env).plan((0, 0), (3, 3)))
+    assert isinstance(agent.history, list)
+    assert agent.history[-1] == (3, 3)
+
+
+def test_agent_compact_history_is_opt_in():
+    env = GridEnvironment(4, 4)
+    agent = DeliveryAgent((0, 0), (3, 3), env, history=CompactPath((0, 0)))
+    path = AStarPlanner(env).plan((0, 0), (3, 3))
+    assert agent.execute_path(path)
+    assert agent.history == path
+
+
+def test_scenario_step_with_one_cell_path():
+    env = GridEnvironment(4, 4)
+    scenario = Scenario(env)
+    agent = DeliveryAgent((1, 1), (1, 1), env)
+    scenario.add_agent(agent, AStarPlanner(env).plan((1, 1), (1, 1)))
+    assert scenario.step() == 0
+    assert scenario.agents[-1]['status'] == 'done'
+
+
+def test_scenario_occupancy_and_lazy_flags():
+    env = GridEnvironment(5, 1)
+    env.add_moving_obstacle([(1, 0), (2, 0), (3, 0)])
+    scenario = Scenario(env)
+    scenario.advance(1)
+    assert scenario.is_blocked(2, 0) and not scenario.is_blocked(1, 0)
+    env.sync_dynamic_flags()
+    assert [env.grid[0][x].dynamic_obstacle for x in range(5)] == [False, False, True, False, False]
+
+def moving_environment():
+    env = GridEnvironment(6, 6)
+    env.add_moving_obstacle([(2, y) for y in range(6)])
+    env.add_moving_obstacle([(0, 3), (1, 3), (2, 3)], speed=2)
+    env.add_moving_obstacle([(5, 5), (6, 5)])  # Leaves the grid every other tick
+    return env
+
+
+def test_obstacle_schedule_matches_moving_obstacles():
+    env = moving_environment()
+    schedule = ObstacleSchedule(env.moving_obstacles)
+    window_xs, window_ys = schedule.positions_window(3, 10)
+    assert window_xs.shape == (10, 3)
+    for t in range(3, 13):
+        xs, ys = schedule.positions(t)
+        expected = [o.get_position_at_time(t) for o in env.moving_obstacles]
+        assert list(zip(xs.tolist(), ys.tolist())) == expected
+        assert (window_xs[t - 3] == xs).all() and (window_ys[t - 3] == ys).all()
+
+
+def test_scenario_advance_jump_matches_single_steps():
+    jumped, stepped = Scenario(moving_environment()), Scenario(moving_environment())
+    jumped.advance(7)
+    for _ in range(7):
+        stepped.advance(1)
+    assert jumped.time == stepped.time == 7
+    assert (jumped.occupancy == stepped.occupancy).all()
+    assert jumped.occupancy.sum() == 2  # The third obstacle is off the grid
+
+
+def test_simulation_engine_runs_agents_to_their_goals():
+    engine = SimulationEngine([moving_environment(), GridEnvironment(4, 4)])
+    for scenario in engine.scenarios:
+        env = scenario.environment
+        goal = (env.width - 1, 2)
+        agent = DeliveryAgent((0, 2), goal, env)
+        scenario.add_agent(agent, AStarPlanner(env).plan((0, 2), goal))
+    ticks = engine.run(max_steps=50)
+    assert ticks < 50 and engine.ticks == ticks
+    for scenario in engine.scenarios:
+        entry = scenario.agents[0]
+        assert entry['status'] == 'done'
+        assert entry['agent'].time_elapsed == len(entry['path']) - 1
+    # The obstacle sweeping column 2 blocks the first agent for a tick
+    waits = engine.scenarios[0].agents[0]['waits']
+    assert waits > 0 and ticks == 5 + waits
+
+
+def test_execute_timed_reports_time_dependent_cost():
+    env, start, goal = load_map(os.path.join(MAP_DIR, 'rush_hour.map'))
+    planner = TimeDependentAStarPlanner(env, start_time=40)
+    path = planner.plan(start, goal)
+    agent = DeliveryAgent(start, goal, env)
+    assert agent.execute_timed(path, planner.arrival_times, planner.departure_times)
+    waits = sum(d - a for a, d in zip(planner.arrival_times, planner.departure_times))
+    assert agent.time_elapsed == planner.arrival_times[-1] - 40
+    assert agent.total_cost == agent.time_elapsed - waits
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
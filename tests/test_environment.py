@@ -0,0 +1,176 @@
+import io
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.environment import GridEnvironment, Terrain
+from src.connectivity import label_components
+from src.mapgen import CityMapGenerator, ROAD, GRASS, SAND, WATER
+from src.utils import load_map
+
+
+def same_partition(index, env):
+    """Whether the index groups passable cells exactly like a full relabel"""
+    labels = label_components(np.isfinite(env.cost_array))
+    pairs = {}
+    for y in range(env.height):
+        for x in range(env.width):
+            component = index.component(x, y)
+            if (component < 0) != (labels[y, x] < 0):
+                return False
+            if component >= 0 and pairs.setdefault(component, labels[y, x]) != labels[y, x]:
+                return False
+    return len(set(pairs.values())) == len(pairs)
+
+
+def test_incremental_connectivity_matches_relabel():
+    rng = random.Random(7)
+    env = GridEnvironment(15, 12)
+    index = env.connectivity
+    for _ in range(300):
+        x, y = rng.randrange(env.width), rng.randrange(env.height)
+        if rng.random() < 0.6:
+            env.set_static_obstacle(x, y)
+        else:
+            # Reopen the cell the way the experiments do
+            env.grid[y][x].is_obstacle = False
+            env.set_terrain(x, y, rng.choice(list(Terrain)))
+        assert same_partition(index, env)
+
+
+def test_connectivity_blocked_start_leaves_through_neighbours():
+    env = GridEnvironment(5, 1)
+    env.set_static_obstacle(0, 0)
+    env.set_static_obstacle(2, 0)
+    assert env.connectivity.is_reachable((0, 0), (1, 0))
+    assert not env.connectivity.is_reachable((0, 0), (4, 0))
+
+
+def test_dead_end_mask_removes_corridors_but_not_loops():
+    # A corridor along row 1 with a spur at (3, 0) and a 2x2 room below (1, 1)
+    open_cells = {(x, 1) for x in range(7)} | {(3, 0), (1, 2), (2, 2), (1, 3), (2, 3)}
+    env = GridEnvironment(7, 4)
+    for y in range(4):
+        for x in range(7):
+            if (x, y) not in open_cells:
+                env.set_static_obstacle(x, y)
+
+    removed = env.connectivity.dead_end_mask(keep=((0, 1), (4, 1)))
+    assert set(zip(*np.nonzero(removed.T))) == {(3, 0), (5, 1), (6, 1)}
+    # Without the goal the whole corridor past the room collapses
+    removed = env.connectivity.dead_end_mask(keep=((0, 1),))
+    assert set(zip(*np.nonzero(removed.T))) == {(3, 0), (3, 1), (4, 1), (5, 1), (6, 1)}
+
+
+def test_revision_counts_static_edits():
+    env = GridEnvironment(3, 3)
+    before = env.revision
+    env.set_terrain(1, 1, Terrain.SAND)
+    env.set_static_obstacle(0, 0)
+    assert env.revision == before + 2
+
+
+def city_text(seed, **options):
+    output = io.StringIO()
+    CityMapGenerator(57, 43, seed=seed, **options).write(output)
+    return output.getvalue()
+
+
+def test_city_generator_is_reproducible():
+    assert city_text(3) == city_text(3)
+    assert city_text(3) != city_text(4)
+    # Rows are derived from the seed alone, so any order gives the same map
+    generator = CityMapGenerator(57, 43, seed=3)
+    backwards = [generator.row(y) for y in reversed(range(43))][::-1]
+    assert all((a == b).all() for a, b in zip(CityMapGenerator(57, 43, seed=3).rows(), backwards))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_city_map_round_trips_through_loader(tmp_path, compact):
+    generator = CityMapGenerator(57, 43, seed=5, moving_density=0.01)
+    filename = str(tmp_path / 'city.map')
+    generator.save(filename, compact)
+    env, start, goal = load_map(filename)
+
+    assert (env.width, env.height) == (57, 43)
+    assert (start, goal) == generator.endpoints()
+    costs = np.full(256, float('inf'))
+    for char, terrain in ((ROAD, Terrain.ROAD), (GRASS, Terrain.GRASS),
+                          (SAND, Terrain.SAND), (WATER, Terrain.WATER)):
+        costs[char] = terrain.value
+    chars = np.array([generator.row(y) for y in range(generator.height)])
+    assert (env.cost_array == costs[chars]).all()
+    routes = list(generator.moving_obstacles())
+    assert routes
+    assert [(o.speed, o.path) for o in env.moving_obstacles] == routes
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('size', [(97, 83), (96, 84)])
+def test_city_streets_and_open_blocks_are_connected(seed, size):
+    generator = CityMapGenerator(*size, seed=seed, block_size=6, maze_density=0.3,
+                                 terrain_density=0.2, water_density=0.2)
+    chars = np.array([generator.row(y) for y in range(generator.height)])
+    block = generator.block_size
+
+    # Streets stay roads even where lakes cover them, bridges included
+    streets = np.zeros(chars.shape, dtype=bool)
+    streets[::block, :] = streets[:, ::block] = True
+    streets[-1, :] = streets[:, -1] = True
+    assert (chars[streets] == ROAD).all()
+    assert (chars == WATER).any() and (chars == GRASS).any()
+
+    # Everything passable, maze corridors and flooded blocks included, is one component
+    labels = label_components(chars != ord('X'))
+    assert len(np.unique(labels[labels >= 0])) == 1
+
+
+MAP_WITH_LAYERS = """3 2
+0 0 2 1
+R G S
+R R W
+LAYER rush R=4 G=1.5
+LAYER rush R=2 AREA 0 1 0 1
+LAYER night R=0.5
+SCHEDULE 10 night base rush
+"""
+
+
+def load(tmp_path, text):
+    filename = tmp_path / 'layers.map'
+    filename.write_text(text)
+    env = GridEnvironment(1, 1)
+    return env, env.load_from_file(str(filename))
+
+
+def test_parse_layers_and_schedule(tmp_path):
+    env, (start, goal) = load(tmp_path, MAP_WITH_LAYERS)
+    assert (start, goal) == ((0, 0), (2, 1))
+    assert env.slot_length == 10
+    assert [env.layer_names[i] for i in env.layer_schedule] == ['night', 'base', 'rush']
+
+    # Static costs are unchanged, layered costs follow the schedule
+    assert env.get_cost(0, 0) == 1
+    assert env.get_layered_cost(0, 0, 5) == 0.5
+    assert env.get_layered_cost(0, 0, 15) == 1
+    assert env.get_layered_cost(0, 0, 25) == 4
+    assert env.get_layered_cost(1, 0, 25) == 4.5
+    assert env.get_layered_cost(0, 1, 25) == 2  # AREA overrides the first line
+    assert env.get_layered_cost(2, 0, 25) == 5  # Sand has no factor
+    assert env.get_layered_cost(0, 0, 35) == 0.5  # The schedule cycles
+    assert env.next_slot_start(12) == 20
+
+
+@pytest.mark.parametrize('line', ['LAYER rush X=2', 'LAYER rush R', 'SCHEDULE 10'])
+def test_parse_layers_rejects_bad_lines(tmp_path, line):
+    with pytest.raises(ValueError):
+        load(tmp_path, "3 2\n0 0 2 1\nR G S\nR R W\n" + line + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,294 @@
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.environment import GridEnvironment, Terrain
+from src.utils import calculate_path_cost, load_map
+from src.planners.informed import AStarPlanner, TimeDependentAStarPlanner
+from src.planners.uninformed import BFSPlanner, UniformCostPlanner
+from src.planners.memory_bounded import FrontierAStarPlanner
+from src.planners.open_lists import OPEN_LISTS, make_open_list
+from src.planners.contraction import ContractionHierarchyPlanner
+from src.planners.local_search import GeneticPlanner
+from src.planners.realtime import RealTimePlanner
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maps')
+
+
+def random_grid(size, seed):
+    rng = random.Random(seed)
+    env = GridEnvironment(size, size)
+    for y in range(size):
+        for x in range(size):
+            roll = rng.random()
+            if roll < 0.2:
+                env.set_static_obstacle(x, y)
+            elif roll < 0.4:
+                env.set_terrain(x, y, Terrain.GRASS)
+            elif roll < 0.5:
+                env.set_terrain(x, y, Terrain.SAND)
+    for x, y in ((0, 0), (size - 1, size - 1)):
+        env.grid[y][x].is_obstacle = False
+        env.set_terrain(x, y, Terrain.ROAD)
+    return env, (0, 0), (size - 1, size - 1)
+
+
+def assert_valid(path, env, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+        assert env.get_cost(x2, y2) < float('inf')
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 5])
+@pytest.mark.parametrize('heuristic', ['manhattan', 'euclidean'])
+def test_open_lists_match_astar(seed, heuristic):
+    env, start, goal = random_grid(25, seed)
+    reference = AStarPlanner(env, heuristic)
+    path = reference.plan(start, goal)
+    cost = calculate_path_cost(path, env)
+
+    for kind in OPEN_LISTS:
+        astar = AStarPlanner(env, heuristic, open_list=kind)
+        path = astar.plan(start, goal)
+        assert_valid(path, env, start, goal)
+        assert calculate_path_cost(path, env) == pytest.approx(cost)
+        if kind in ('bucket', 'radix'):
+            # Same tie-breaking as the binary heap, down to insertion order
+            assert astar.nodes_expanded == reference.nodes_expanded
+        assert calculate_path_cost(UniformCostPlanner(env, open_list=kind).plan(start, goal),
+                                   env) == pytest.approx(cost)
+
+
+@pytest.mark.parametrize('kind', sorted(OPEN_LISTS))
+def test_open_list_pop_order(kind):
+    rng = random.Random(3)
+    open_list, reference = make_open_list(kind), make_open_list('binary')
+    last = 0.0
+    for _ in range(2000):
+        if rng.random() < 0.6 or not len(reference):
+            node, priority, g = rng.randrange(100), last + rng.random() * 10, rng.choice([0, 1, 2.5])
+            open_list.push(node, priority, g)
+            reference.push(node, priority, g)
+        else:
+            popped = open_list.pop()
+            assert popped == reference.pop()
+            last = popped[0]
+    assert len(open_list) == len(reference)
+
+
+@pytest.mark.parametrize('kind', ['bucket', 'radix'])
+@pytest.mark.parametrize('fractional_after', [None, 1000])
+def test_bucket_lists_break_integer_ties_like_binary_heap(kind, fractional_after):
+    rng = random.Random(4)
+    open_list, reference = make_open_list(kind), make_open_list('binary')
+    last = 0
+    for i in range(2000):
+        if rng.random() < 0.6 or not len(reference):
+            node = rng.randrange(100)
+            if fractional_after is None or i < fractional_after:
+                priority, g = last + rng.randrange(10), rng.randrange(4)
+            else:
+                # Switches the buckets over to heaps with integer entries queued
+                priority, g = last + rng.random() * 10, rng.choice([0, 1, 2.5])
+            open_list.push(node, priority, g)
+            reference.push(node, priority, g)
+        else:
+            popped = open_list.pop()
+            assert popped == reference.pop()
+            last = popped[0]
+    while len(reference):
+        assert open_list.pop() == reference.pop()
+    assert not len(open_list)
+
+
+def test_unreachable_goal_is_rejected_without_search():
+    env = GridEnvironment(6, 6)
+    for y in range(6):
+        env.set_static_obstacle(3, y)
+    for planner in (BFSPlanner(env), UniformCostPlanner(env), AStarPlanner(env)):
+        assert planner.plan((0, 0), (5, 5)) == []
+        assert planner.nodes_expanded == 0
+
+
+@pytest.mark.parametrize('planner_class', [BFSPlanner, UniformCostPlanner, AStarPlanner])
+def test_dead_end_pruning_keeps_optimal_paths(planner_class):
+    expanded, pruned_expanded = 0, 0
+    for seed in range(4):
+        env, start, goal = random_grid(30, seed)
+        plain = planner_class(env)
+        pruning = planner_class(env, prune_dead_ends=True)
+        path, pruned_path = plain.plan(start, goal), pruning.plan(start, goal)
+        if not path:
+            assert pruned_path == []
+            continue
+        assert_valid(pruned_path, env, start, goal)
+        if planner_class is BFSPlanner:
+            assert len(pruned_path) == len(path)
+        else:
+            assert calculate_path_cost(pruned_path, env) == calculate_path_cost(path, env)
+        dead = env.connectivity.dead_end_mask(keep=(start, goal))
+        assert not any(dead[y, x] for x, y in pruned_path)
+        expanded += plain.nodes_expanded
+        pruned_expanded += pruning.nodes_expanded
+    assert pruned_expanded < expanded
+
+
+def test_contraction_hierarchy_matches_astar_and_follows_edits():
+    env, start, goal = random_grid(12, 1)
+    planner = ContractionHierarchyPlanner(env)
+    astar = AStarPlanner(env)
+    rng = random.Random(0)
+    for _ in range(20):
+        a = (rng.randrange(12), rng.randrange(12))
+        b = (rng.randrange(12), rng.randrange(12))
+        expected = astar.plan(a, b)
+        path = planner.plan(a, b)
+        assert (calculate_path_cost(path, env) if path else None) == \
+            (calculate_path_cost(expected, env) if expected else None)
+
+    path = planner.plan(start, goal)
+    blocked = path[len(path) // 2]
+    env.set_static_obstacle(*blocked)
+    path = planner.plan(start, goal)
+    assert blocked not in path
+    assert calculate_path_cost(path, env) == calculate_path_cost(astar.plan(start, goal), env)
+
+
+@pytest.mark.parametrize('name', ['small', 'medium', 'large', 'dynamic'])
+def test_genetic_planner_finds_valid_paths(name):
+    env, start, goal = load_map(os.path.join(MAP_DIR, f'{name}.map'))
+    planner = GeneticPlanner(env, generations=40, time_budget=None, seed=1)
+    path = planner.plan(start, goal)
+    assert_valid(path, env, start, goal)
+    assert 0 < planner.generations_run <= 40
+    assert calculate_path_cost(path, env) >= calculate_path_cost(AStarPlanner(env).plan(start, goal), env)
+
+
+def test_genetic_planner_is_reproducible_with_a_seed():
+    env, start, goal = random_grid(15, 2)
+    runs = [GeneticPlanner(env, generations=20, time_budget=None, seed=7).plan(start, goal)
+            for _ in range(2)]
+    assert runs[0] == runs[1]
+    # Populations smaller than the seed paths keep the first seeds
+    assert_valid(GeneticPlanner(env, population_size=3, elite_size=2, generations=10,
+                                time_budget=None, seed=7).plan(start, goal), env, start, goal)
+
+
+@pytest.mark.parametrize('options', [{'population_size': 1}, {'elite_size': 60},
+                                     {'elite_size': -1}, {'tournament_size': 0}])
+def test_genetic_planner_rejects_bad_sizes(options):
+    with pytest.raises(ValueError):
+        GeneticPlanner(GridEnvironment(4, 4), **options)
+
+
+def test_realtime_ignores_passing_obstacles_when_learning():
+    env = GridEnvironment(3, 2)
+    env.add_moving_obstacle([(1, 0), (1, 0), (1, 1), (1, 1)])
+    planner = RealTimePlanner(env)
+    steps = list(planner.steps((0, 0), (2, 0), start_time=0))
+    assert steps[-1] == (2, 0)
+    assert planner.heuristic((2, 0))[0, 0] == 2
+
+
+def test_realtime_rejects_empty_lookahead():
+    with pytest.raises(ValueError):
+        RealTimePlanner(GridEnvironment(3, 3), lookahead=0)
+
+
+def test_realtime_converges_to_optimal_cost():
+    env, start, goal = load_map(os.path.join(MAP_DIR, 'medium.map'))
+    planner = RealTimePlanner(env, lookahead=4)
+    planner.train(start, goal)
+    path = planner.plan(start, goal)
+    assert_valid(path, env, start, goal)
+    assert calculate_path_cost(path, env) == calculate_path_cost(AStarPlanner(env).plan(start, goal), env)
+
+
+class SlowSetupPlanner(RealTimePlanner):
+    def is_reachable(self, start, goal):
+        time.sleep(0.05)
+        return super().is_reachable(start, goal)
+
+
+def test_realtime_first_move_latency_includes_setup():
+    env = GridEnvironment(20, 20)
+    planner = SlowSetupPlanner(env)
+    path = planner.plan((0, 0), (19, 19))
+    assert path[-1] == (19, 19)
+    assert len(planner.step_latencies) == len(path) - 1
+    assert planner.first_move_latency >= planner.setup_latency >= 0.05
+    assert max(planner.step_latencies[1:]) < 0.05
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 5])
+def test_frontier_astar_matches_astar(seed):
+    env, start, goal = random_grid(25, seed)
+    cost = calculate_path_cost(AStarPlanner(env).plan(start, goal), env)
+    planner = FrontierAStarPlanner(env)
+    path = planner.plan(start, goal)
+    assert_valid(path, env, start, goal)
+    assert calculate_path_cost(path, env) == cost
+    assert not planner.pruned
+
+
+@pytest.mark.parametrize('max_nodes', [10, 20, 40])
+def test_frontier_node_budget_bounds_open_list(max_nodes):
+    env, start, goal = random_grid(30, 12)
+    cost = calculate_path_cost(AStarPlanner(env).plan(start, goal), env)
+    planner = FrontierAStarPlanner(env, max_nodes=max_nodes)
+    path = planner.plan(start, goal)
+    assert_valid(path, env, start, goal)
+    assert calculate_path_cost(path, env) >= cost
+    assert planner.pruned
+    assert planner.node_budget >= max_nodes
+    assert planner.peak_nodes <= planner.node_budget
+
+
+def test_frontier_byte_budget_sets_node_limit():
+    env, start, goal = random_grid(30, 12)
+    planner = FrontierAStarPlanner(env, max_bytes=40 * FrontierAStarPlanner.BYTES_PER_NODE)
+    assert planner.node_limit == 40
+    assert planner.plan(start, goal)
+    assert planner.peak_memory == planner.peak_nodes * FrontierAStarPlanner.BYTES_PER_NODE
+
+
+def test_frontier_relaxes_a_thrashing_budget():
+    # Pruning forgets nodes, so this budget re-expands the same cells until
+    # the search is retried with a larger one
+    env, start, goal = random_grid(30, 12)
+    planner = FrontierAStarPlanner(env, max_nodes=10)
+    path = planner.plan(start, goal)
+    assert_valid(path, env, start, goal)
+    assert planner.retries > 0
+    assert planner.node_budget == 10 * 2 ** planner.retries
+    assert not planner.budget_exhausted
+
+
+def test_frontier_expansion_budget_is_reported():
+    env, start, goal = random_grid(30, 12)
+    planner = FrontierAStarPlanner(env, max_nodes=10, max_expansions=50)
+    assert planner.plan(start, goal) == []
+    assert planner.budget_exhausted
+
+
+def test_time_dependent_astar_timing():
+    env, start, goal = load_map(os.path.join(MAP_DIR, 'rush_hour.map'))
+    for start_time in (0, 25, 40):
+        planner = TimeDependentAStarPlanner(env, start_time=start_time)
+        path = planner.plan(start, goal)
+        assert_valid(path, env, start, goal)
+        arrivals, departures = planner.arrival_times, planner.departure_times
+        assert arrivals[0] == start_time
+        for i in range(1, len(path)):
+            assert departures[i - 1] >= arrivals[i - 1]
+            assert arrivals[i] == departures[i - 1] + env.get_layered_cost(*path[i], departures[i - 1])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))